@@ -1,25 +1,56 @@
 """Handles simulation requests and returns decay data and plots as JSON."""
 
-from flask import Blueprint, request, jsonify
-import numpy as np, io, base64
-import matplotlib.pyplot as plt
+from flask import Blueprint, Response, request, jsonify, stream_with_context, url_for
+import numpy as np, io, base64, json, os
+from contextlib import nullcontext
 
-from app.utils.isotope_loader import load_unstable_isotopes
-from app.utils.decay_simulator import DecaySimulation
-from app.static.models.isotopes import Isotope
-from app.utils.input_validation import is_input_valid
+from app.utils.isotope_registry import get_registry
+from app.utils.decay_simulator import DecaySimulation, linspace_chunks
+from app.utils.batch_simulator import BatchDecaySimulation
+from app.utils.decay_matrix import get_matrix_store
+from app.static.models.isotopes import Isotope, to_seconds
+from app.utils.input_validation import (
+    is_input_valid, is_export_input_valid, is_chain_input_valid, is_ensemble_input_valid, is_query_input_valid
+)
+from app.utils.decay_queries import QUERIES, evaluate_query
+from app.utils.job_queue import JobQueue
+from app.utils.metrics import StageTimer, render_metrics
+from app.utils.monte_carlo import METHODS, ensemble_statistics, sample_ensemble
+from app.utils.parallel_monte_carlo import merge_moments, run_ensemble_parallel
+from app.utils.plot_cache import PlotCache
+from app.utils.plot_renderer import borrow_template, figure_to_png, plot_spec, render_in_pool
+from app.utils.response_format import encode_columns, is_format_valid
+from app.utils.time_grid import GRID_STRATEGIES, MIN_GRID_POINTS, build_time_grid
 
 api_bp = Blueprint('api', __name__)
-ISOTOPES = load_unstable_isotopes()
+PLOT_CACHE = PlotCache(max_bytes=int(os.environ.get('PLOT_CACHE_MAX_BYTES', 32 * 1024 * 1024)))
+PLOT_RENDER_WORKERS = int(os.environ.get('PLOT_RENDER_WORKERS', 0))       # 0 renders in the request thread
+MC_WORKERS = int(os.environ.get('MC_WORKERS', 0))                         # 0 runs ensembles in the request thread
+JOB_QUEUE = JobQueue(
+    workers=int(os.environ.get('JOB_WORKERS', 2)),
+    max_jobs=int(os.environ.get('JOB_MAX_RESULTS', 256)),
+    ttl=float(os.environ.get('JOB_RESULT_TTL', 600))                      # seconds a finished result is kept
+)
 
-@api_bp.route('/simulate', methods=['POST'])
-def simulate():
-    data = request.json
+STREAM_ENSEMBLE_UPDATES = 10                                               # ensemble statistics events per stream
+
+EXPORT_FORMATS = {
+    'ndjson': ('application/x-ndjson', '{"time": %.10g, "remaining": %.10g, "decayed": %.10g, "rate": %.10g, "gamma": %d}'),
+    'csv': ('text/csv', '%.10g,%.10g,%.10g,%.10g,%d')
+}
+
+def resolve_isotope(data):
+    """
+    Look up the isotope a request names, or build the custom isotope it describes.
 
+    Returns:
+        (Isotope) the isotope, or None if it is missing or invalid
+        (str) error message when there is no isotope
+    """
     isotope_id = data.get('isotope', '').strip()
 
     if not isotope_id:
-        return jsonify({'error': 'No isotope selected.'}), 400
+        return None, 'No isotope selected.'
 
     if isotope_id == 'custom':
         try:
@@ -30,47 +61,68 @@ def simulate():
                 half_life_unit=data['custom_half_life_unit']
             )
         except (KeyError, ValueError):
-            return jsonify({'error': 'Invalid custom isotope input.'}), 400
-        isotope = custom_isotope
-    else:
-        if isotope_id not in ISOTOPES:
-            return jsonify({'error': f"Isotope '{isotope_id}' not found."}), 400
-        isotope = ISOTOPES[isotope_id]
+            return None, 'Invalid custom isotope input.'
+        return custom_isotope, None
+
+    isotope = get_registry().get(isotope_id)
+    if isotope is None:
+        return None, f"Isotope '{isotope_id}' not found."
+    return isotope, None
+
+
+def build_simulation(data, validate=is_input_valid, build_grid=True):
+    """
+    Validate a simulation request body and build the matching DecaySimulation.
+
+    Args:
+        data (dict): request body
+        validate (callable): range check applied to the initial amount, time points and noise
+        build_grid (bool): materialize the time grid; callers that stream chunks pass False and get an empty grid,
+            which only the linear grid supports
+
+    Returns:
+        (DecaySimulation) the configured simulation, or None if the input is invalid
+        (str) error message when the input is invalid
+    """
+    isotope, error = resolve_isotope(data)
+    if error:
+        return None, error
 
     try:
         initial_amount = float(data['initial_amount'])
         time_points = int(data['time_points'])
         noise = int(data['noise'])
         graph = data['checkedBoxes']
-    except (KeyError, ValueError):
-        return jsonify({'error': 'Invalid simulation parameters.'}), 400
-
-    if not is_input_valid(initial_amount, time_points, noise):
-        return jsonify({'error': 'Input values out of range or malformed.'}), 400
+        seed = data.get('seed')
+        seed = None if seed is None else int(seed)
+        grid = data.get('grid', 'linear')
+        tolerance = float(data.get('tolerance', 1e-3))
+    except (KeyError, ValueError, TypeError):
+        return None, 'Invalid simulation parameters.'
 
-    max_time = isotope.half_life * 4
-    time_pts = np.linspace(0, max_time, time_points)
+    if not validate(initial_amount, time_points, noise) or not 0 < tolerance < 1:
+        return None, 'Input values out of range or malformed.'
+    if grid not in GRID_STRATEGIES or (grid != 'linear' and not build_grid):
+        return None, 'Invalid time grid.'
 
     sim = DecaySimulation(
         init_amt=initial_amount,
         half_life=isotope.half_life,
-        time_pts=time_pts,
+        time_pts=np.empty(0),
         isotope_name=isotope.name,
         half_life_unit=isotope.half_life_unit,
         noise_percentage=noise,
         gamma_emission_probability=isotope.gamma_emission_probability / 100,
-        graph=graph
+        graph=graph,
+        seed=seed
     )
+    if build_grid:
+        sim.set_time_grid(grid, time_points, tolerance=tolerance)
+    return sim, None
 
-    amt_decayed, decay_rate, amt_remaining, gamma_emissions = sim.plot_decay()
-
-    img = io.BytesIO()
-    plt.savefig(img, format='png', bbox_inches='tight')
-    img.seek(0)
-    plot_url = base64.b64encode(img.getvalue()).decode()
-    plt.close()
 
-    data_points = [
+def format_rows(time_pts, amt_remaining, amt_decayed, decay_rate, gamma_emissions):
+    return [
         {
             'time': f"{time_pts[i]:.2f}",
             'remaining': f"{amt_remaining[i]:.2f}",
@@ -81,7 +133,544 @@ def simulate():
         for i in range(len(time_pts))
     ]
 
-    return jsonify({
+
+def sse_event(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+
+def render_png(sim, series=None, timer=None):
+    """
+    Render the decay plot, reusing a cached image when the same deterministic simulation was rendered before.
+
+    Args:
+        timer (StageTimer, optional): records the cache lookup, drawing and PNG encoding as separate stages
+
+    Returns:
+        (bytes) PNG image
+    """
+    stage = timer.stage if timer else untimed
+
+    key = sim.cache_key()
+    if key is not None:
+        with stage('cache'):
+            png = PLOT_CACHE.get(key)
+        if png is not None:
+            return png
+
+    if PLOT_RENDER_WORKERS:
+        with stage('render_pool'):
+            png = render_in_pool(sim, series, PLOT_RENDER_WORKERS)
+    else:
+        with borrow_template() as template:
+            with stage('draw'):
+                fig = sim.plot_decay(series, template)
+            with stage('savefig'):
+                png = figure_to_png(fig)
+
+    if key is not None:
+        PLOT_CACHE.put(key, png)
+    return png
+
+
+def untimed(name):
+    return nullcontext()
+
+
+def handle_simulate(data, timer=None):
+    """
+    Run a /simulate request body. The route and background jobs both call this.
+
+    Args:
+        timer (StageTimer, optional): records each stage of the request
+
+    Returns:
+        (int) HTTP status
+        (dict) JSON body
+    """
+    stage = timer.stage if timer else untimed
+
+    with stage('parse'):
+        sim, error = build_simulation(data)
+    if error:
+        return 400, {'error': error}
+
+    response_format = data.get('format', 'rows')
+    encoding = data.get('encoding', 'json')
+    dtype = data.get('dtype', 'float64')
+    render = data.get('render', 'server')
+    if (response_format not in ('rows', 'columnar') or render not in ('server', 'client')
+            or not is_format_valid(encoding, dtype)):
+        return 400, {'error': 'Invalid response format.'}
+
+    with stage('compute'):
+        series = sim.calc_series()
+    amt_decayed, decay_rate, amt_remaining, gamma_emissions = series
+    time_pts = sim.time_pts
+
+    with stage('data_points'):
+        if response_format == 'columnar':
+            data_points = encode_columns({
+                'time': time_pts,
+                'remaining': amt_remaining,
+                'decayed': amt_decayed,
+                'rate': decay_rate,
+                'gamma': gamma_emissions
+            }, encoding=encoding, dtype=dtype)
+        else:
+            data_points = format_rows(time_pts, amt_remaining, amt_decayed, decay_rate, gamma_emissions)
+
+    # browsers that draw the chart themselves get its description instead of a PNG
+    if render == 'client':
+        return 200, {'data': data_points, 'plot_spec': plot_spec(sim)}
+
+    # data-only clients skip the matplotlib render entirely
+    if not data.get('include_plot', True):
+        return 200, {'data': data_points}
+
+    png = render_png(sim, series, timer)
+    with stage('base64'):
+        plot_url = base64.b64encode(png).decode()
+    return 200, {
         'plot': plot_url,
         'data': data_points
+    }
+
+
+@api_bp.route('/simulate', methods=['POST'])
+def simulate():
+    data = request.json
+    timer = StageTimer()
+
+    status, body = handle_simulate(data, timer)
+    if status != 200:
+        return jsonify(body), status
+
+    with timer.stage('serialize'):
+        response = jsonify(body)
+
+    # custom isotope names come from the client, so they share one label to keep the metric bounded
+    isotope_id = data.get('isotope', '').strip()
+    isotope = 'custom' if isotope_id == 'custom' else get_registry().get(isotope_id).name
+    response.headers['Server-Timing'] = timer.finish(isotope)
+    return response
+
+
+@api_bp.route('/metrics', methods=['GET'])
+def metrics():
+    return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
+
+
+@api_bp.route('/simulate/plot', methods=['POST'])
+def simulate_plot():
+    sim, error = build_simulation(request.json)
+    if error:
+        return jsonify({'error': error}), 400
+
+    return Response(render_png(sim), mimetype='image/png')
+
+
+@api_bp.route('/simulate/export', methods=['POST'])
+def simulate_export():
+    data = request.json
+
+    sim, error = build_simulation(data, validate=is_export_input_valid, build_grid=False)
+    if error:
+        return jsonify({'error': error}), 400
+
+    export_format = data.get('format', 'ndjson')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'error': 'Invalid export format.'}), 400
+
+    try:
+        chunk_size = int(data.get('chunk_size', 10_000))
+    except (ValueError, TypeError):
+        return jsonify({'error': 'Invalid chunk size.'}), 400
+    if not 1 <= chunk_size <= 100_000:
+        return jsonify({'error': 'Invalid chunk size.'}), 400
+
+    mimetype, row_format = EXPORT_FORMATS[export_format]
+    time_chunks = linspace_chunks(0, sim.half_life * 4, int(data['time_points']), chunk_size)
+
+    def generate():
+        if export_format == 'csv':
+            yield 'time,remaining,decayed,rate,gamma\n'
+
+        for time_pts, amt_decayed, decay_rate, amt_remaining, gamma_emissions in sim.iter_series(time_chunks):
+            rows = np.column_stack((time_pts, amt_remaining, amt_decayed, decay_rate, gamma_emissions))
+            chunk = io.StringIO()
+            np.savetxt(chunk, rows, fmt=row_format)
+            yield chunk.getvalue()
+
+    filename = f"{sim.isotope_name}_decay.{export_format}"
+    return Response(stream_with_context(generate()), mimetype=mimetype,
+                    headers={'Content-Disposition': f'attachment; filename="{filename}"'})
+
+
+@api_bp.route('/simulate/stream', methods=['GET'])
+def simulate_stream():
+    # EventSource can only send GET, so the simulation parameters arrive as query arguments
+    data = request.args.to_dict()
+    data['checkedBoxes'] = request.args.getlist('checkedBoxes')
+
+    # the rows end up in the page's table, so the stream keeps the interactive limits; bulk
+    # downloads go through /simulate/export
+    sim, error = build_simulation(data, build_grid=False)
+    if error:
+        return jsonify({'error': error}), 400
+
+    try:
+        chunk_size = int(data.get('chunk_size', 1000))
+        runs = int(data.get('runs', 0))
+    except (ValueError, TypeError):
+        return jsonify({'error': 'Invalid stream parameters.'}), 400
+
+    time_points = int(data['time_points'])
+    method = data.get('method', 'binomial')
+    if not 1 <= chunk_size <= 100_000 or method not in METHODS:
+        return jsonify({'error': 'Invalid stream parameters.'}), 400
+    if runs and not is_ensemble_input_valid(runs, time_points, []):
+        return jsonify({'error': 'Invalid ensemble parameters.'}), 400
+
+    max_time = sim.half_life * 4
+    time_chunks = linspace_chunks(0, max_time, time_points, chunk_size)
+
+    def generate():
+        yield sse_event('meta', {
+            'isotope': sim.isotope_name,
+            'half_life': sim.half_life,
+            'half_life_unit': sim.half_life_unit,
+            'time_points': time_points
+        })
+
+        for time_pts, amt_decayed, decay_rate, amt_remaining, gamma_emissions in sim.iter_series(time_chunks):
+            yield sse_event('rows', format_rows(time_pts, amt_remaining, amt_decayed, decay_rate, gamma_emissions))
+
+        if runs:
+            # statistics are pushed after every batch of runs so the client watches them converge
+            time_pts = np.linspace(0, max_time, time_points)
+            count, mean, m2 = 0, np.zeros(time_points), np.zeros(time_points)
+            for batch in np.array_split(np.arange(runs), min(runs, STREAM_ENSEMBLE_UPDATES)):
+                block = sample_ensemble(sim.init_amt, sim.decay_const, time_pts, batch.size, sim.rng, method)
+                block_mean = block.mean(axis=0)
+                count, mean, m2 = merge_moments(count, mean, m2, batch.size, block_mean, ((block - block_mean) ** 2).sum(axis=0))
+                yield sse_event('ensemble', {
+                    'runs': count,
+                    'data': encode_columns({'time': time_pts, 'mean': mean, 'variance': m2 / count})
+                })
+
+        yield sse_event('done', {'time_points': time_points, 'runs': runs})
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+def handle_ensemble(data):
+    """
+    Run a /simulate/ensemble request body. The route and background jobs both call this.
+
+    Returns:
+        (int) HTTP status
+        (dict) JSON body
+    """
+    data = {'noise': 0, 'checkedBoxes': [], **data}
+
+    sim, error = build_simulation(data)
+    if error:
+        return 400, {'error': error}
+
+    percentiles = data.get('percentiles', [5, 50, 95])
+    if not isinstance(percentiles, list):
+        return 400, {'error': 'Percentiles must be a list.'}
+
+    try:
+        runs = int(data.get('runs', 1000))
+        percentiles = [float(p) for p in percentiles]
+    except (ValueError, TypeError):
+        return 400, {'error': 'Invalid ensemble parameters.'}
+
+    method = data.get('method', 'binomial')
+    encoding = data.get('encoding', 'json')
+    dtype = data.get('dtype', 'float64')
+    if (method not in METHODS or not is_format_valid(encoding, dtype)
+            or not is_ensemble_input_valid(runs, sim.time_pts.size, percentiles)):
+        return 400, {'error': 'Invalid ensemble parameters.'}
+
+    if MC_WORKERS:
+        stats = run_ensemble_parallel(sim, runs, method, workers=MC_WORKERS, percentiles=percentiles)
+    else:
+        stats = ensemble_statistics(sim.simulate_ensemble(runs, method), percentiles)
+
+    columns = {
+        'time': sim.time_pts,
+        # runs start from a whole number of atoms, see `sample_ensemble`
+        'expected': round(sim.init_amt) * np.exp(-sim.decay_const * sim.time_pts),
+        'mean': stats['mean'],
+        'variance': stats['variance']
+    }
+    columns.update({f"p{p:g}": values for p, values in stats['percentiles'].items()})
+
+    return 200, {
+        'runs': runs,
+        'method': method,
+        'data': encode_columns(columns, encoding=encoding, dtype=dtype)
+    }
+
+
+@api_bp.route('/simulate/ensemble', methods=['POST'])
+def simulate_ensemble():
+    status, body = handle_ensemble(request.json)
+    return jsonify(body), status
+
+
+@api_bp.route('/query', methods=['POST'])
+def query_decay():
+    data = request.json
+
+    isotope, error = resolve_isotope(data)
+    if error:
+        return jsonify({'error': error}), 400
+
+    query = data.get('query')
+    if not isinstance(query, str) or query not in QUERIES:
+        return jsonify({'error': f"Unknown query, expected one of: {', '.join(QUERIES)}."}), 400
+    _, value_name = QUERIES[query]
+
+    try:
+        initial_amount = float(data['initial_amount'])
+        values = np.atleast_1d(np.asarray(data[value_name], dtype=float)).ravel()
+    except (KeyError, ValueError, TypeError):
+        return jsonify({'error': 'Invalid query parameters.'}), 400
+
+    encoding = data.get('encoding', 'json')
+    dtype = data.get('dtype', 'float64')
+    if (not is_query_input_valid(initial_amount, values, thresholds=value_name != 'time')
+            or not is_format_valid(encoding, dtype)):
+        return jsonify({'error': 'Input values out of range or malformed.'}), 400
+
+    # times and rates are in the isotope's own half-life unit, as in every other endpoint
+    decay_const = np.log(2) / isotope.half_life
+    answers = evaluate_query(query, initial_amount, decay_const, values)
+
+    return jsonify({
+        'isotope': isotope.name,
+        'query': query,
+        'time_unit': isotope.half_life_unit,
+        'data': encode_columns({value_name: values, query: answers}, encoding=encoding, dtype=dtype)
     })
+
+
+def handle_chain(data):
+    """
+    Run a /chain request body. The route and background jobs both call this.
+
+    Returns:
+        (int) HTTP status
+        (dict) JSON body
+    """
+    isotope_id = data.get('isotope', '')
+    try:
+        initial_amount = float(data['initial_amount'])
+        time_points = int(data['time_points'])
+        max_time = data.get('max_time')                                     # in the parent's half-life unit
+        max_time = None if max_time is None else float(max_time)
+    except (KeyError, ValueError, TypeError):
+        return 400, {'error': 'Invalid simulation parameters.'}
+
+    encoding = data.get('encoding', 'json')
+    dtype = data.get('dtype', 'float64')
+    if (not is_chain_input_valid(isotope_id, initial_amount, time_points, max_time)
+            or not is_format_valid(encoding, dtype)):
+        return 400, {'error': 'Input values out of range or malformed.'}
+
+    store = get_matrix_store()
+    parent = get_registry().get(isotope_id)
+    if parent is None:
+        return 400, {'error': f"Isotope '{isotope_id}' not found."}
+    chain = store.chain(parent.short_name)
+    if max_time is None:
+        max_time = parent.half_life * 4
+
+    grid = data.get('grid', 'linear')
+    try:
+        tolerance = float(data.get('tolerance', 1e-3))
+    except (ValueError, TypeError):
+        return 400, {'error': 'Invalid simulation parameters.'}
+    if grid not in GRID_STRATEGIES or time_points < MIN_GRID_POINTS[grid] or not 0 < tolerance < 1:
+        return 400, {'error': 'Invalid time grid.'}
+
+    # log and adaptive grids reach down to the shortest-lived member, which for chains like
+    # U-238 sits many orders of magnitude below the parent's half-life
+    unit_seconds = to_seconds(1, parent.half_life_unit)
+    unstable = chain.decay_consts[chain.decay_consts > 0]
+    min_time = min(np.log(2) / unstable.max() / unit_seconds / 10, max_time / 10)
+
+    time_pts = build_time_grid(
+        grid, max_time, time_points, tolerance=tolerance, min_time=min_time,
+        curve=lambda time_pts: store.solve(chain, initial_amount, time_pts * unit_seconds)
+    )
+    amounts = store.solve(chain, initial_amount, time_pts * unit_seconds)
+
+    return 200, {
+        'members': chain.members,
+        'decay_consts': chain.decay_consts.tolist(),
+        'time_unit': parent.half_life_unit,
+        'time': encode_columns({'time': time_pts}, encoding=encoding, dtype=dtype),
+        'series': encode_columns({
+            'amounts': amounts,
+            'activity': chain.activity(amounts)
+        }, encoding=encoding, dtype=dtype)
+    }
+
+
+@api_bp.route('/chain', methods=['POST'])
+def simulate_chain():
+    status, body = handle_chain(request.json)
+    return jsonify(body), status
+
+
+@api_bp.route('/chain/cache', methods=['GET'])
+def chain_cache_stats():
+    return jsonify(get_matrix_store().stats())
+
+
+@api_bp.route('/simulate/cache', methods=['GET'])
+def plot_cache_stats():
+    return jsonify(PLOT_CACHE.stats())
+
+
+def handle_batch(data):
+    """
+    Run a /simulate/batch request body. The route and background jobs both call this.
+
+    Returns:
+        (int) HTTP status
+        (dict) JSON body
+    """
+    registry = get_registry()
+
+    isotope_ids = data.get('isotopes', 'all')
+    if isotope_ids == 'all':
+        isotope_ids = list(registry.keys)
+    elif not isinstance(isotope_ids, list) or not isotope_ids:
+        return 400, {'error': 'No isotopes selected.'}
+
+    isotope_ids = [str(isotope_id).strip().lower() for isotope_id in isotope_ids]
+    missing = [isotope_id for isotope_id in isotope_ids if isotope_id not in registry]
+    if missing:
+        return 400, {'error': f"Isotopes not found: {', '.join(missing)}"}
+
+    try:
+        initial_amounts = [float(amt) for amt in np.atleast_1d(data['initial_amounts'])]
+        noise_levels = [int(noise) for noise in np.atleast_1d(data.get('noise', 0))]
+        time_points = int(data['time_points'])
+        seed = data.get('seed')
+        seed = None if seed is None else int(seed)
+    except (KeyError, ValueError, TypeError):
+        return 400, {'error': 'Invalid simulation parameters.'}
+
+    if not all(is_input_valid(amt, time_points, noise) for amt in initial_amounts for noise in noise_levels):
+        return 400, {'error': 'Input values out of range or malformed.'}
+
+    isotopes = [registry.get(isotope_id) for isotope_id in isotope_ids]
+
+    # one scenario per (isotope, initial amount, noise level) combination
+    iso_idx, amt_idx, noise_idx = (idx.ravel() for idx in np.meshgrid(
+        np.arange(len(isotopes)), np.arange(len(initial_amounts)), np.arange(len(noise_levels)), indexing='ij'
+    ))
+
+    half_lives = np.array([iso.half_life for iso in isotopes])[iso_idx]
+    gamma_probabilities = np.array([iso.gamma_emission_probability / 100 for iso in isotopes])[iso_idx]
+    init_amts = np.array(initial_amounts)[amt_idx]
+    noise = np.array(noise_levels)[noise_idx]
+
+    time_pts = BatchDecaySimulation.scaled_time_grid(half_lives, time_points)
+    sim = BatchDecaySimulation(
+        init_amts=init_amts,
+        half_lives=half_lives,
+        time_pts=time_pts,
+        noise_percentages=noise,
+        gamma_emission_probabilities=gamma_probabilities,
+        seed=seed
+    )
+
+    amt_decayed, decay_rate, amt_remaining, gamma_emissions = sim.calc_series()
+
+    scenarios = [
+        {
+            'isotope': isotope_ids[i],
+            'name': isotopes[i].name,
+            'half_life_unit': isotopes[i].half_life_unit,
+            'initial_amount': initial_amounts[a],
+            'noise': noise_levels[n]
+        }
+        for i, a, n in zip(iso_idx, amt_idx, noise_idx)
+    ]
+
+    return 200, {
+        'scenarios': scenarios,
+        'time': time_pts.tolist(),
+        'remaining': amt_remaining.tolist(),
+        'decayed': amt_decayed.tolist(),
+        'rate': decay_rate.tolist(),
+        'gamma': gamma_emissions.tolist()
+    }
+
+
+@api_bp.route('/simulate/batch', methods=['POST'])
+def simulate_batch():
+    status, body = handle_batch(request.json)
+    return jsonify(body), status
+
+
+# job kinds and the request handler each one runs in the background
+JOB_HANDLERS = {
+    'simulate': handle_simulate,
+    'batch': handle_batch,
+    'ensemble': handle_ensemble,
+    'chain': handle_chain
+}
+
+@api_bp.route('/jobs', methods=['POST'])
+def submit_job():
+    data = request.json
+
+    kind = data.get('kind')
+    params = data.get('params')
+    if kind not in JOB_HANDLERS or not isinstance(params, dict):
+        return jsonify({'error': 'Invalid job request.'}), 400
+
+    job = JOB_QUEUE.submit(kind, JOB_HANDLERS[kind], params)
+    if job is None:
+        return jsonify({'error': 'Too many pending jobs, try again later.'}), 503
+
+    status_url = url_for('api.job_status', job_id=job.id)
+    return jsonify({
+        **job.describe(),
+        'status_url': status_url,
+        'result_url': url_for('api.job_result', job_id=job.id)
+    }), 202, {'Location': status_url}
+
+
+@api_bp.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    job = JOB_QUEUE.get(job_id)
+    if job is None:
+        return jsonify({'error': f"Job '{job_id}' not found or expired."}), 404
+
+    return jsonify(job.describe())
+
+
+@api_bp.route('/jobs/<job_id>/result', methods=['GET'])
+def job_result(job_id):
+    job = JOB_QUEUE.get(job_id)
+    if job is None:
+        return jsonify({'error': f"Job '{job_id}' not found or expired."}), 404
+
+    if job.status == 'failed':
+        return jsonify({'error': job.error}), 500
+    if job.status != 'done':
+        return jsonify(job.describe()), 202
+
+    # replay the handler's own response, including its validation errors
+    status_code, body = job.result
+    return jsonify(body), status_code
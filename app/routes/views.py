@@ -1,15 +1,13 @@
 """Page-rendering routes for the main UI and static views."""
 
 from flask import Blueprint, render_template
-from ..utils.isotope_loader import load_unstable_isotopes
+from ..utils.isotope_registry import get_registry
 
 views_bp = Blueprint('views', __name__)
 
-ISOTOPES = load_unstable_isotopes()
-
 @views_bp.route('/')
 def index():
-    return render_template('index.html', isotopes=ISOTOPES)
+    return render_template('index.html', isotopes=get_registry().isotopes)
 
 @views_bp.route('/about')
 def about():
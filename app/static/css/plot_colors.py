@@ -3,6 +3,9 @@
 def rgb(r, g, b):
     return (r/255, g/255, b/255)
 
+def to_css(color):
+    return 'rgb({}, {}, {})'.format(*(round(c * 255) for c in color))
+
 cyan = rgb(0, 184, 217)
 coral = rgb(255, 127, 80)
 yellow = rgb(255, 198, 30)
@@ -73,19 +73,32 @@ function initializeSimulationForm(form) {
   form.addEventListener("submit", handleSimulationSubmit);
 }
 
-function handleSaveImage() {
-  const plotImg = document.getElementById("decayPlot").src;
-  const a = document.createElement("a");
-  a.href = plotImg;
-  a.download = "decay_plot.png";
-  document.body.appendChild(a);
-  a.click();
-  document.body.removeChild(a);
+let lastSimulation = null;
+
+// the chart is drawn in the browser; saved images still come from the server renderer
+async function handleSaveImage() {
+  if (!lastSimulation) {
+    return;
+  }
 
   const saveImageButton = document.getElementById("saveImageButton");
   saveImageButton.disabled = true;
   saveImageButton.innerHTML = '<span class="spinner">↻</span> Saving...';
 
+  try {
+    const plotUrl = await fetchPlot(lastSimulation);
+    const a = document.createElement("a");
+    a.href = plotUrl;
+    a.download = "decay_plot.png";
+    document.body.appendChild(a);
+    a.click();
+    document.body.removeChild(a);
+    URL.revokeObjectURL(plotUrl);
+  } catch (error) {
+    console.error("Error:", error);
+    showError("An error occurred while saving the image.");
+  }
+
   setTimeout(() => {
     saveImageButton.disabled = false;
     saveImageButton.innerHTML = "Save as Image";
@@ -117,7 +130,8 @@ async function handleSimulationSubmit(e) {
     submitButton.disabled = false;
     submitButton.innerHTML = "Run Simulation";
 
-    document.getElementById("decayPlot").src = "";
+    const plotCanvas = document.getElementById("decayPlot");
+    plotCanvas.getContext("2d").clearRect(0, 0, plotCanvas.width, plotCanvas.height);
     document.getElementById("selectedIsotopeDisplay").textContent = "";
     document.getElementById("results").style.display = "none";
 
@@ -141,21 +155,22 @@ async function handleSimulationSubmit(e) {
     data.custom_gamma = form.custom_gamma.value;
   }
 
+  // the plot, the table and saved images all draw their noise from the same seed, and
+  // resubmitting the same form reuses it so the server's plot cache can answer
+  data.seed = seedFor(data);
+  lastSimulation = data;
+
   try {
-    const response = await fetch("/simulate", {
-      method: "POST",
-      headers: {
-        "Content-Type": "application/json",
-      },
-      body: JSON.stringify(data),
-    });
+    const selectedText = showSimulationResults();
 
-    if (!response.ok) {
-      throw new Error(`HTTP error! status: ${response.status}`);
-    }
+    // one request fills both the chart and the table
+    const result = await fetchPlotData(data);
+    drawDecayPlot(document.getElementById("decayPlot"), result.data.columns, result.plot_spec);
+    document.getElementById("plotLoader").style.display = "none";
 
-    const result = await response.json();
-    updateSimulationResults(result);
+    const rows = columnsToRows(result.data.columns);
+    renderDataPoints(rows);
+    updateSimulationResults(rows, selectedText);
   } catch (error) {
     console.error("Error:", error);
     showError("An error occurred while processing the request.");
@@ -165,12 +180,212 @@ async function handleSimulationSubmit(e) {
   }
 }
 
-function updateSimulationResults(result) {
-  const plotImg = document.getElementById("decayPlot");
-  plotImg.src = `data:image/png;base64,${result.plot}`;
+// 31-bit FNV-1a hash of the form state, so the seed stays stable for identical inputs
+function seedFor(data) {
+  let hash = 0x811c9dc5;
+  for (const char of JSON.stringify(data)) {
+    hash = Math.imul(hash ^ char.charCodeAt(0), 0x01000193);
+  }
+  return (hash >>> 0) % 2 ** 31;
+}
+
+async function fetchPlot(data) {
+  const response = await fetch("/simulate/plot", {
+    method: "POST",
+    headers: {
+      "Content-Type": "application/json",
+    },
+    body: JSON.stringify(data),
+  });
+
+  if (!response.ok) {
+    throw new Error(`HTTP error! status: ${response.status}`);
+  }
+
+  return URL.createObjectURL(await response.blob());
+}
+
+async function fetchPlotData(data) {
+  const response = await fetch("/simulate", {
+    method: "POST",
+    headers: {
+      "Content-Type": "application/json",
+    },
+    body: JSON.stringify({ ...data, render: "client", format: "columnar" }),
+  });
+
+  if (!response.ok) {
+    throw new Error(`HTTP error! status: ${response.status}`);
+  }
+
+  return response.json();
+}
 
-  const tableBody = document.getElementById("dataTable");
-  tableBody.innerHTML = result.data
+const LINE_DASHES = { "-": [], "--": [8, 5], ":": [2, 4] };
+
+function niceTicks(min, max, count = 6) {
+  const rough = (max - min || 1) / count;
+  const magnitude = 10 ** Math.floor(Math.log10(rough));
+  const step = [1, 2, 2.5, 5, 10].map((m) => m * magnitude).find((s) => s >= rough);
+
+  const ticks = [];
+  for (let tick = Math.ceil(min / step) * step; tick <= max + step * 1e-9; tick += step) {
+    ticks.push(Number(tick.toPrecision(12)));
+  }
+  return ticks;
+}
+
+function formatTick(value) {
+  const magnitude = Math.abs(value);
+  if (magnitude !== 0 && (magnitude >= 1e5 || magnitude < 1e-3)) {
+    return value.toExponential(1);
+  }
+  return String(Number(value.toPrecision(6)));
+}
+
+// mirrors the server-side matplotlib template using the styles in the plot spec
+function drawDecayPlot(canvas, columns, spec) {
+  const ctx = canvas.getContext("2d");
+  const { width, height } = canvas;
+  const margin = { top: 50, right: 30, bottom: 60, left: 90 };
+  const plotWidth = width - margin.left - margin.right;
+  const plotHeight = height - margin.top - margin.bottom;
+
+  const time = columns.time;
+  const series = spec.series.filter((s) => s.visible);
+  const values = series.flatMap((s) => columns[s.key]);
+
+  // 5% padding around the data, like matplotlib's default margins
+  const pad = (min, max) => {
+    const span = max - min || Math.abs(max) || 1;
+    return [min - span * 0.05, max + span * 0.05];
+  };
+  const [xMin, xMax] = pad(Math.min(...time), Math.max(...time));
+  const [yMin, yMax] = values.length ? pad(Math.min(...values), Math.max(...values)) : [0, 1];
+  const toX = (t) => margin.left + ((t - xMin) / (xMax - xMin)) * plotWidth;
+  const toY = (v) => margin.top + (1 - (v - yMin) / (yMax - yMin)) * plotHeight;
+
+  ctx.fillStyle = spec.colors.background;
+  ctx.fillRect(0, 0, width, height);
+  ctx.font = "12px sans-serif";
+  ctx.lineWidth = 1;
+
+  // grid and tick labels
+  ctx.strokeStyle = spec.colors.grid;
+  ctx.fillStyle = spec.colors.text;
+  ctx.globalAlpha = 0.2;
+  const xTicks = niceTicks(xMin, xMax).filter((t) => t >= xMin && t <= xMax);
+  const yTicks = niceTicks(yMin, yMax).filter((t) => t >= yMin && t <= yMax);
+  ctx.beginPath();
+  xTicks.forEach((t) => {
+    ctx.moveTo(toX(t), margin.top);
+    ctx.lineTo(toX(t), margin.top + plotHeight);
+  });
+  yTicks.forEach((t) => {
+    ctx.moveTo(margin.left, toY(t));
+    ctx.lineTo(margin.left + plotWidth, toY(t));
+  });
+  ctx.stroke();
+  ctx.globalAlpha = 1;
+
+  ctx.textAlign = "center";
+  ctx.textBaseline = "top";
+  xTicks.forEach((t) => ctx.fillText(formatTick(t), toX(t), margin.top + plotHeight + 6));
+  ctx.textAlign = "right";
+  ctx.textBaseline = "middle";
+  yTicks.forEach((t) => ctx.fillText(formatTick(t), margin.left - 6, toY(t)));
+
+  ctx.strokeStyle = spec.colors.text;
+  ctx.strokeRect(margin.left, margin.top, plotWidth, plotHeight);
+
+  // data series, clipped to the axes
+  ctx.save();
+  ctx.beginPath();
+  ctx.rect(margin.left, margin.top, plotWidth, plotHeight);
+  ctx.clip();
+  ctx.lineWidth = 1.5;
+  series.forEach((s) => {
+    const ys = columns[s.key];
+    ctx.strokeStyle = s.color;
+    ctx.fillStyle = s.color;
+    ctx.setLineDash(LINE_DASHES[s.linestyle] || []);
+    ctx.beginPath();
+    time.forEach((t, i) => (i ? ctx.lineTo(toX(t), toY(ys[i])) : ctx.moveTo(toX(t), toY(ys[i]))));
+    ctx.stroke();
+    time.forEach((t, i) => {
+      ctx.beginPath();
+      ctx.arc(toX(t), toY(ys[i]), 2, 0, 2 * Math.PI);
+      ctx.fill();
+    });
+  });
+
+  const hl = spec.half_life;
+  if (hl.visible) {
+    ctx.strokeStyle = hl.color;
+    ctx.setLineDash(LINE_DASHES[hl.linestyle] || []);
+    ctx.beginPath();
+    ctx.moveTo(toX(hl.x), margin.top);
+    ctx.lineTo(toX(hl.x), margin.top + plotHeight);
+    ctx.stroke();
+  }
+  ctx.restore();
+
+  // title and axis labels
+  ctx.fillStyle = spec.colors.text;
+  ctx.textAlign = "center";
+  ctx.textBaseline = "alphabetic";
+  ctx.font = "16px sans-serif";
+  ctx.fillText(spec.title, margin.left + plotWidth / 2, margin.top - 16);
+  ctx.font = "13px sans-serif";
+  ctx.fillText(spec.x_label, margin.left + plotWidth / 2, height - 16);
+  ctx.save();
+  ctx.translate(20, margin.top + plotHeight / 2);
+  ctx.rotate(-Math.PI / 2);
+  ctx.fillText(spec.y_label, 0, 0);
+  ctx.restore();
+
+  // legend in the top right corner of the axes
+  const entries = hl.visible ? [...series, hl] : series;
+  if (entries.length) {
+    ctx.font = "12px sans-serif";
+    const legendWidth = 40 + Math.max(...entries.map((e) => ctx.measureText(e.label).width));
+    const left = margin.left + plotWidth - legendWidth - 10;
+    const top = margin.top + 10;
+    ctx.fillStyle = spec.colors.background;
+    ctx.strokeStyle = spec.colors.grid;
+    ctx.fillRect(left, top, legendWidth, entries.length * 20 + 8);
+    ctx.strokeRect(left, top, legendWidth, entries.length * 20 + 8);
+
+    ctx.textAlign = "left";
+    ctx.textBaseline = "middle";
+    entries.forEach((e, i) => {
+      const y = top + 14 + i * 20;
+      ctx.strokeStyle = e.color;
+      ctx.setLineDash(LINE_DASHES[e.linestyle] || []);
+      ctx.beginPath();
+      ctx.moveTo(left + 8, y);
+      ctx.lineTo(left + 30, y);
+      ctx.stroke();
+      ctx.setLineDash([]);
+      ctx.fillStyle = spec.colors.text;
+      ctx.fillText(e.label, left + 36, y);
+    });
+  }
+}
+
+// same row format as the server's `format_rows`
+function columnsToRows(columns) {
+  return columns.time.map((time, i) => ({
+    time: time.toFixed(2),
+    remaining: columns.remaining[i].toFixed(2),
+    decayed: columns.decayed[i].toFixed(2),
+    rate: columns.rate[i].toFixed(2),
+    gamma: String(columns.gamma[i]),
+  }));
+}
+
+function renderDataPoints(rows) {
+  document.getElementById("dataTable").innerHTML = rows
     .map(
       (point) => `
         <tr>
@@ -183,6 +398,11 @@ function updateSimulationResults(result) {
     `
     )
     .join("");
+}
+
+function showSimulationResults() {
+  document.getElementById("dataTable").innerHTML = "";
+  document.getElementById("plotLoader").style.display = "block";
 
   const results = document.getElementById("results");
   results.style.display = "block";
@@ -196,10 +416,14 @@ function updateSimulationResults(result) {
   const selectedText = isotopeSelect.options[isotopeSelect.selectedIndex].text;
   document.getElementById("selectedIsotopeDisplay").textContent = selectedText;
 
+  return selectedText;
+}
+
+function updateSimulationResults(rows, selectedText) {
 // Create a download link for the simulation data
 const simulationData =
   "data:text/json;charset=utf-8," +
-  encodeURIComponent(JSON.stringify(result.data, null, 2));
+  encodeURIComponent(JSON.stringify(rows, null, 2));
 
 // Remove any existing download link to avoid duplicates
 const existingDownloadLink = document.getElementById("saveSimulationData");
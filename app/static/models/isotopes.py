@@ -2,12 +2,35 @@
 
 from dataclasses import dataclass
 
+TIME_UNITS_IN_SECONDS = {
+    'ns': 1e-9,
+    'µs': 1e-6,
+    'us': 1e-6,
+    'ms': 1e-3,
+    's': 1,
+    'm': 60,
+    'h': 3600,
+    'd': 86400,
+    'y': 31556926
+}
+
+def to_seconds(value, unit):
+    if unit not in TIME_UNITS_IN_SECONDS:
+        raise ValueError(f"Unknown time unit '{unit}'.")
+    return value * TIME_UNITS_IN_SECONDS[unit]
+
 @dataclass
 class Isotope:
     name: str
     half_life: float
     gamma_emission_probability: float
     half_life_unit: str                     # s, d, or y
+    short_name: str = None                  # e.g. U-238
+    atomic_number: int = None
+    decay_mode: str = None                  # e.g. alpha, beta minus
+    daughter: str = None                    # short name of the daughter nucleus
+    half_life_seconds: float = None
+    decay_const: float = None               # per second
 
 # CARBON_14 = Isotope(name="Carbon-14", half_life=5730, gamma_emission_probability=0, half_life_unit='y')
 # RADIUM_226 = Isotope(name="Radium-226", half_life=1600, gamma_emission_probability=3.6, half_life_unit='y')
@@ -0,0 +1,139 @@
+"""Sparse decay matrix for the whole nuclide network, with cached per-chain eigendecompositions."""
+
+import os
+import threading
+import numpy as np
+from collections import OrderedDict
+from scipy import sparse
+
+from .decay_chain import MAX_CHAIN_LENGTH, DecayChain, daughter_label
+from .isotope_registry import get_registry
+
+class DecayMatrixStore:
+    """
+    Holds the network's transition matrix A (dN/dt = A N) in CSR form: A[i, i] = -λ_i and
+    A[daughter(i), i] = λ_i. Daughters outside the dataset become stable nodes with an empty column.
+
+    Chain eigendecompositions are kept in an LRU cache. The eigenvector matrix of a chain is lower
+    triangular, so any chain that is a tail of a cached one (e.g. Rn-222 inside the Ra-226 chain)
+    is served by slicing the cached matrices instead of being decomposed again.
+    """
+
+    def __init__(self, registry, max_cached_chains=256):
+        self.nuclides = [iso.short_name for iso in registry.isotopes.values()]
+        self.index = {name: i for i, name in enumerate(self.nuclides)}
+
+        rows, cols, values = [], [], []
+        for i, iso in enumerate(registry.isotopes.values()):
+            daughter = daughter_label(iso)
+            if daughter not in self.index:
+                self.index[daughter] = len(self.nuclides)
+                self.nuclides.append(daughter)
+
+            rows += [i, self.index[daughter]]
+            cols += [i, i]
+            values += [-iso.decay_const, iso.decay_const]
+
+        size = len(self.nuclides)
+        self.matrix = sparse.csr_matrix((values, (rows, cols)), shape=(size, size))
+        self.decay_consts = np.abs(self.matrix.diagonal())
+        self._lower_index = {name.lower(): i for name, i in self.index.items()}
+
+        self._columns = self.matrix.tocsc()
+        self._cache = OrderedDict()         # chain members -> eigendecomposition
+        self._tails = {}                    # chain tail -> (cached chain members, offset)
+        self._lock = threading.Lock()
+        self.max_cached_chains = max_cached_chains
+        self.hits = 0
+        self.misses = 0
+
+    def daughters(self, i):
+        column = self._columns.getcol(i)
+        return [j for j in column.indices if j != i]
+
+    def chain(self, parent, max_length=MAX_CHAIN_LENGTH):
+        """
+        Walk the matrix from `parent` to a stable node.
+
+        Returns:
+            (DecayChain) the chain, or None if the parent is not in the network
+        """
+        i = self._lower_index.get(parent.strip().lower())
+        if i is None:
+            return None
+
+        members = [i]
+        while len(members) < max_length:
+            daughters = self.daughters(i)
+            if not daughters or daughters[0] in members:
+                break
+            i = daughters[0]
+            members.append(i)
+
+        return DecayChain(members=[self.nuclides[i] for i in members], decay_consts=self.decay_consts[members])
+
+    def decomposition(self, chain):
+        """
+        Cached eigendecomposition of a chain, see `DecayChain.eigendecomposition`.
+        """
+        key = tuple(chain.members)
+        with self._lock:
+            cached = self._lookup(key)
+            if cached is not None:
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        decomposition = chain.eigendecomposition()
+
+        with self._lock:
+            self._insert(key, decomposition)
+        return decomposition
+
+    def solve(self, chain, init_amts, time_pts):
+        return chain.solve(init_amts, time_pts, decomposition=self.decomposition(chain))
+
+    def stats(self):
+        with self._lock:
+            return {'chains': len(self._cache), 'hits': self.hits, 'misses': self.misses}
+
+    def _lookup(self, key):
+        if key not in self._tails:
+            return None
+
+        owner, offset = self._tails[key]
+        self._cache.move_to_end(owner)
+        eigenvalues, vectors, inverse = self._cache[owner]
+        if offset == 0:
+            return eigenvalues, vectors, inverse
+        return eigenvalues[offset:], vectors[offset:, offset:], inverse[offset:, offset:]
+
+    def _insert(self, key, decomposition):
+        if key in self._cache:
+            return
+
+        self._cache[key] = decomposition
+        for offset in range(len(key)):
+            self._tails.setdefault(key[offset:], (key, offset))
+
+        while len(self._cache) > self.max_cached_chains:
+            evicted, _ = self._cache.popitem(last=False)
+            for offset in range(len(evicted)):
+                tail = evicted[offset:]
+                if self._tails.get(tail, (None,))[0] == evicted:
+                    del self._tails[tail]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_matrix_store():
+    """
+    Return the process-wide decay matrix store, building it from the isotope registry on first use.
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = DecayMatrixStore(get_registry(), max_cached_chains=int(os.environ.get('CHAIN_CACHE_SIZE', 256)))
+    return _store
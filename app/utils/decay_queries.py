@@ -0,0 +1,52 @@
+"""Closed-form answers to point queries about a single decay curve, without building a time grid."""
+
+import numpy as np
+
+def remaining_at(init_amt, decay_const, times):
+    return init_amt * np.exp(-decay_const * times)
+
+
+def decayed_at(init_amt, decay_const, times):
+    # expm1 keeps full precision for times much shorter than the half-life
+    return -init_amt * np.expm1(-decay_const * times)
+
+
+def activity_at(init_amt, decay_const, times):
+    return decay_const * remaining_at(init_amt, decay_const, times)
+
+
+def time_until_remaining(init_amt, decay_const, amounts):
+    """
+    Time until the remaining amount first drops to each of `amounts`; 0 for amounts at or above `init_amt`.
+    """
+    return np.maximum(np.log(init_amt / amounts), 0) / decay_const
+
+
+def time_until_activity(init_amt, decay_const, activities):
+    return time_until_remaining(init_amt, decay_const, activities / decay_const)
+
+
+# query name -> (function, name of the values it takes)
+QUERIES = {
+    'remaining': (remaining_at, 'time'),
+    'decayed': (decayed_at, 'time'),
+    'activity': (activity_at, 'time'),
+    'time_to_remaining': (time_until_remaining, 'amount'),
+    'time_to_activity': (time_until_activity, 'activity')
+}
+
+def evaluate_query(query, init_amt, decay_const, values):
+    """
+    Evaluate one of `QUERIES` for an array of query values in a single vectorized pass.
+
+    Args:
+        query (str): key of `QUERIES`
+        init_amt (float): amount at t=0
+        decay_const (float): decay constant, in the inverse of the unit the times are given in
+        values (np.ndarray): query times, or amount/activity thresholds for the time_to_* queries
+
+    Returns:
+        (np.ndarray) one answer per query value
+    """
+    func, _ = QUERIES[query]
+    return func(init_amt, decay_const, np.asarray(values, dtype=float))
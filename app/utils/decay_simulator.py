@@ -1,13 +1,26 @@
 """Handles radioactive decay simulation, activity calculation, and plotting."""
 
+import hashlib
 import numpy as np
-import matplotlib.pyplot as plt
 
 from dataclasses import dataclass
-from ..static.css.plot_colors import *
+from .plot_renderer import DecayPlotTemplate
+from .monte_carlo import sample_ensemble_blocks
+from .rng import make_rng, spawn_rngs
+from .time_grid import build_time_grid
+
+def linspace_chunks(start, stop, num, chunk_size):
+    """
+    Generate the same points as `np.linspace(start, stop, num)` in consecutive chunks of at most `chunk_size`.
+    """
+    step = (stop - start) / (num - 1) if num > 1 else 0
+    for first in range(0, num, chunk_size):
+        idx = np.arange(first, min(first + chunk_size, num))
+        chunk = start + idx * step
+        if num > 1 and idx[-1] == num - 1:
+            chunk[-1] = stop
+        yield chunk
 
-import matplotlib
-matplotlib.use('Agg')
 
 @dataclass 
 class DecaySimulation:
@@ -19,23 +32,58 @@ class DecaySimulation:
     noise_percentage: int 
     gamma_emission_probability: float
     graph: str
+    seed: int = None                        # int, SeedSequence or Generator; None draws fresh entropy
 
     def __post_init__(self):
         self.decay_const = np.log(2) / self.half_life
+        self.rng = make_rng(self.seed)
+        # noise and gamma draws get their own streams so evaluating the grid in chunks consumes
+        # each stream in the same order as one full evaluation and reproduces it exactly
+        self.noise_rng, self.gamma_rng = spawn_rngs(self.seed, 2)
     
-    def calculate_decay(self):
+    def set_time_grid(self, strategy='linear', time_points=50, max_time=None, tolerance=1e-3):
+        """
+        Replace self.time_pts with a grid built by one of the `time_grid.GRID_STRATEGIES`. Adaptive
+        grids are refined against the noiseless remaining curve, using at most `time_points` points.
+
+        Args:
+            max_time (float, optional): end of the grid, defaults to four half-lives
+
+        Returns:
+            (np.ndarray) the new time points
+        """
+        if max_time is None:
+            max_time = self.half_life * 4
+        self.time_pts = build_time_grid(
+            strategy, max_time, time_points, tolerance=tolerance,
+            curve=lambda time_pts: self.init_amt * np.exp(-self.decay_const * time_pts)
+        )
+        return self.time_pts
+
+    def calculate_decay(self, out_decayed=None, out_remaining=None, time_pts=None):
         """
         Calculate the amount of radioactive material remaining and amount decayed at each of the time points in self.time_pts.
 
+        Args:
+            out_decayed, out_remaining (np.ndarray, optional): preallocated arrays to write the results into
+            time_pts (np.ndarray, optional): time points to evaluate instead of self.time_pts
+
         Returns: 
             (np.ndarray) amount of decayed radioactive material at each time point `amt_decayed`
             (np.ndarray) amount of remaining radioactive material at each time point `amt_remaining`
         """
-        exp_dt = self.decay_const * self.time_pts
-        amt_remaining = self.init_amt * np.exp(-exp_dt)
-        noise = np.random.normal(0, (self.noise_percentage / 100) * amt_remaining, size=self.time_pts.size)
-        amt_remaining = amt_remaining + noise
-        amt_decayed = self.init_amt - amt_remaining
+        if time_pts is None:
+            time_pts = self.time_pts
+        size = time_pts.size
+        amt_remaining = np.empty(size) if out_remaining is None else out_remaining
+        amt_decayed = np.empty(size) if out_decayed is None else out_decayed
+
+        np.multiply(-self.decay_const, time_pts, out=amt_remaining)
+        np.exp(amt_remaining, out=amt_remaining)
+        amt_remaining *= self.init_amt
+        if self.noise_percentage:
+            amt_remaining += self.noise_rng.normal(0, (self.noise_percentage / 100) * amt_remaining, size=size)
+        np.subtract(self.init_amt, amt_remaining, out=amt_decayed)
     
         return amt_decayed, amt_remaining
     
@@ -49,15 +97,94 @@ class DecaySimulation:
         _, remaining = self.calculate_decay()
         return self.decay_const * remaining
     
-    def calc_gamma_emissions(self):
-        amt_decayed, _ = self.calculate_decay()
+    def calc_gamma_emissions(self, amt_decayed=None):
+        if amt_decayed is None:
+            amt_decayed, _ = self.calculate_decay()
         amt_decayed_int = np.maximum(amt_decayed, 0).astype(int)            # ensure positive value
         gamma_probability = self.gamma_emission_probability
 
-        gamma_emissions = np.random.binomial(n=amt_decayed_int, p=gamma_probability)
+        gamma_emissions = self.gamma_rng.binomial(n=amt_decayed_int, p=gamma_probability)
 
         return gamma_emissions
 
+    def calc_series(self, time_pts=None):
+        """
+        Calculate every plotted series from a single evaluation of the decay curve, so the
+        remaining, decayed, activity and gamma columns all come from the same noise draw.
+
+        Args:
+            time_pts (np.ndarray, optional): time points to evaluate instead of self.time_pts
+
+        Returns:
+            (np.ndarray) amount of decayed radioactive material at each time point
+            (np.ndarray) decay rate at each time point
+            (np.ndarray) amount of remaining radioactive material at each time point
+            (np.ndarray) gamma emissions at each time point
+        """
+        if time_pts is None:
+            time_pts = self.time_pts
+        size = time_pts.size
+        amt_decayed = np.empty(size)
+        amt_remaining = np.empty(size)
+        activity = np.empty(size)
+
+        self.calculate_decay(out_decayed=amt_decayed, out_remaining=amt_remaining, time_pts=time_pts)
+        np.multiply(self.decay_const, amt_remaining, out=activity)
+        gamma_emissions = self.calc_gamma_emissions(amt_decayed)
+
+        return amt_decayed, activity, amt_remaining, gamma_emissions
+
+    def iter_series(self, time_chunks):
+        """
+        Lazily calculate the series one chunk of the time grid at a time, so arbitrarily long
+        simulations only ever hold a single chunk in memory. With a seed, the chunks concatenate
+        to exactly what `calc_series` returns for the whole grid.
+
+        Args:
+            time_chunks (iterable): arrays of consecutive time points, e.g. from `linspace_chunks`
+
+        Yields:
+            (np.ndarray) time points of the chunk, followed by the `calc_series` outputs for that chunk
+        """
+        for time_pts in time_chunks:
+            yield (time_pts, *self.calc_series(time_pts))
+
+    def simulate_ensemble(self, runs, method='binomial'):
+        """
+        Simulate `runs` independent stochastic realizations, treating `init_amt` as a count of atoms.
+        Runs are drawn in blocks from children of `seed`, exactly as `run_ensemble_parallel` draws
+        them; `noise_percentage` does not apply.
+
+        Returns:
+            (np.ndarray) remaining atoms with shape (runs, time)
+        """
+        return sample_ensemble_blocks(self.init_amt, self.decay_const, self.time_pts, runs, self.seed, method)
+
+    def cache_key(self):
+        """
+        Build a key identifying the plot this simulation renders. Plots that depend on random draws
+        (noise, or plotted gamma emissions) are only reproducible, and therefore cacheable, with an int seed.
+
+        Returns:
+            (str) hex digest of the normalized parameters, or None if the output is not deterministic
+        """
+        graph = [name for name in ('remaining', 'decayed', 'gamma', 'hl') if name in self.graph]
+
+        random_gamma = 'gamma' in graph and 0 < self.gamma_emission_probability < 1
+        seeded = bool(self.noise_percentage or random_gamma)
+        if seeded and not isinstance(self.seed, (int, np.integer)):
+            return None
+        # deterministic plots ignore the seed, so every seed shares one entry
+        params = (
+            self.isotope_name, float(self.half_life), self.half_life_unit, float(self.init_amt),
+            float(self.noise_percentage), float(self.gamma_emission_probability), graph,
+            int(self.seed) if seeded else None
+        )
+
+        digest = hashlib.sha256(repr(params).encode())
+        digest.update(np.ascontiguousarray(self.time_pts, dtype=float).tobytes())
+        return digest.hexdigest()
+
     def conv_time(self, value:float, from_unit:str, to_unit:str):
         """
         Convert time between units (s, d, y)
@@ -74,61 +201,21 @@ class DecaySimulation:
         seconds = value * to_seconds[from_unit]
         return seconds / to_seconds[to_unit]
 
-    def plot_decay(self):
+    def plot_decay(self, series=None, template=None):
         """
         Plot the radioactive decay process showing both the amount of material remaining and the amount that has decayed over time.
-        """
-        plt.style.use('dark_background')
-        
-        amt_decayed, amt_remaining = self.calculate_decay()
-        gamma_decay = self.calc_gamma_emissions()
-        activity = self.calc_activity()
-
-        graph_remaining = False
-        graph_decayed = False
-        graph_gamma_emissions = False
-        graph_hl = False
-
-        if 'remaining' in self.graph: graph_remaining = True
-        if 'decayed' in self.graph: graph_decayed = True
-        if 'gamma' in self.graph: graph_gamma_emissions = True
-        if 'hl' in self.graph: graph_hl = True
-
-        fig, ax1 = plt.subplots(figsize=(10, 6))
-        fig.patch.set_facecolor(table_grey)
-        ax1.set_facecolor(table_grey)
-        
-        if graph_remaining: ax1.plot(self.time_pts, amt_remaining, color=cyan, marker='.', linestyle='-', label='Remaining Material')
-        if graph_decayed: ax1.plot(self.time_pts, amt_decayed, color=coral, marker='.', linestyle='--', label='Decayed Material')
-        if graph_gamma_emissions: ax1.plot(self.time_pts, gamma_decay, color=yellow, marker='.', linestyle=':', label='Gamma Decay')
 
-        ax1.set_xlabel(f'Time ({self.half_life_unit})', color=white)
-        ax1.set_ylabel('Amount of Material', color=white)
-        ax1.tick_params(colors=white)
-        
-        ax2 = ax1.twinx()
-        ax2.set_ylabel('Activity (Bq)', color=grey_400)
-        ax2.tick_params(colors=grey_400)
-        
-        half_life_time = self.half_life
-        if graph_hl: ax1.axvline(x=half_life_time, color=white, 
-                    linestyle='--', label='First Half-Life')
+        Args:
+            series (tuple, optional): precomputed output of `calc_series`; computed here if not given
+            template (DecayPlotTemplate, optional): reusable template to draw into, e.g. from
+                `plot_renderer.borrow_template`; a new one is built if not given
 
-        lines1, labels1 = ax1.get_legend_handles_labels()
-        lines2, labels2 = ax2.get_legend_handles_labels()
-        ax1.legend(lines1 + lines2, labels1 + labels2, 
-                    loc='best', facecolor=table_grey, labelcolor=white)
+        Returns:
+            (Figure) the drawn figure; serialize it before the template is drawn into again
+        """
+        if series is None:
+            series = self.calc_series()
+        if template is None:
+            template = DecayPlotTemplate()
 
-        ax1.grid(True, color=grey_400, alpha=0.2)
-        
-        plt.title(f'Radioactive Decay Simulation for {self.isotope_name}', 
-                    color=white)
-        
-        for spine in ax1.spines.values():
-            spine.set_color(white)
-        for spine in ax2.spines.values():
-            spine.set_color(grey_400)
-                
-        plt.tight_layout()
-
-        return amt_decayed, activity, amt_remaining, gamma_decay  
\ No newline at end of file
+        return template.draw(self, series)
@@ -1,8 +1,53 @@
 """Validates user input values for decay simulation parameters."""
 
+import numpy as np
+
 def is_input_valid(initial_amount, time_points, noise):
     return (
         initial_amount >= 1
         and 10 <= time_points <= 1000
         and 0 <= noise <= 20
     )
+
+
+MAX_EXPORT_TIME_POINTS = 10_000_000
+
+def is_export_input_valid(initial_amount, time_points, noise):
+    return (
+        initial_amount >= 1
+        and 10 <= time_points <= MAX_EXPORT_TIME_POINTS
+        and 0 <= noise <= 20
+    )
+
+
+MAX_CHAIN_TIME_POINTS = 100_000
+
+def is_chain_input_valid(isotope_id, initial_amount, time_points, max_time=None):
+    return (
+        isinstance(isotope_id, str)
+        and initial_amount >= 1
+        and 2 <= time_points <= MAX_CHAIN_TIME_POINTS
+        and (max_time is None or max_time > 0)
+    )
+
+
+MAX_ENSEMBLE_RUNS = 10_000
+MAX_ENSEMBLE_SAMPLES = 10_000_000
+
+def is_ensemble_input_valid(runs, time_points, percentiles):
+    return (
+        1 <= runs <= MAX_ENSEMBLE_RUNS
+        and runs * time_points <= MAX_ENSEMBLE_SAMPLES
+        and all(0 <= p <= 100 for p in percentiles)
+    )
+
+
+MAX_QUERY_VALUES = 100_000
+
+def is_query_input_valid(initial_amount, values, thresholds=False):
+    return (
+        initial_amount >= 1
+        and 1 <= values.size <= MAX_QUERY_VALUES
+        and bool(np.isfinite(values).all())
+        and bool((values > 0).all() if thresholds else (values >= 0).all())
+    )
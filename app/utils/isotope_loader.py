@@ -1,7 +1,11 @@
 """Loads and parses isotope data from a JSON dataset into Isotope objects."""
 
 import json
-from ..static.models.isotopes import Isotope
+import numpy as np
+from pathlib import Path
+from ..static.models.isotopes import Isotope, to_seconds
+
+DATA_PATH = Path(__file__).resolve().parent.parent / 'static' / 'models' / 'unstable_isotopes.json'
 
 def extract_gamma(probability_str):
     try:
@@ -9,16 +13,36 @@ def extract_gamma(probability_str):
     except:
         return 0
 
-def load_unstable_isotopes(filepath="app/static/models/unstable_isotopes.json"):
+def extract_short_name(nucleus_str):
+    """
+    Convert an NNDC nucleus label such as "234 90 Th" into a short name such as "Th-234".
+    """
+    parts = nucleus_str.split()
+    if len(parts) != 3:
+        return None
+    mass_number, _, symbol = parts
+    return f"{symbol}-{mass_number}"
+
+def load_unstable_isotopes(filepath=DATA_PATH):
     with open(filepath) as f:
         raw_data = json.load(f)
 
-    return {
-        key.lower(): Isotope(
+    isotopes = {}
+    for key, val in raw_data.items():
+        half_life = float(val["half_life"])
+        half_life_seconds = to_seconds(half_life, val["half_life_unit"])
+
+        isotopes[key.lower()] = Isotope(
             name=val["name"],
-            half_life=float(val["half_life"]),
+            half_life=half_life,
             half_life_unit=val["half_life_unit"],
-            gamma_emission_probability=extract_gamma(val.get("decay_mode", {}).get("probability", "0"))
+            gamma_emission_probability=extract_gamma(val.get("decay_mode", {}).get("probability", "0")),
+            short_name=val.get("short_name", key),
+            atomic_number=val.get("atomic_number"),
+            decay_mode=val.get("decay_mode", {}).get("type"),
+            daughter=extract_short_name(val.get("daughter_nucleus", "")),
+            half_life_seconds=half_life_seconds,
+            decay_const=np.log(2) / half_life_seconds
         )
-        for key, val in raw_data.items()
-    }
+
+    return isotopes
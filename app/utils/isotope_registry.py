@@ -0,0 +1,85 @@
+"""Shared isotope registry loaded once per process, with precomputed decay constants and lookup indexes."""
+
+import threading
+import numpy as np
+from collections import defaultdict
+from functools import cached_property
+
+from .isotope_loader import DATA_PATH, load_unstable_isotopes
+from .isotope_snapshot import SNAPSHOT_PATH, is_snapshot_current, load_snapshot
+
+class IsotopeRegistry:
+    def __init__(self, isotopes, half_life_seconds=None, decay_consts=None):
+        self.isotopes = isotopes                                # lower-case short name -> Isotope, any mapping
+        self.keys = list(isotopes)
+
+        # column arrays in `keys` order for vectorized callers
+        if half_life_seconds is None:
+            half_life_seconds = np.array([iso.half_life_seconds for iso in isotopes.values()], dtype=float)
+        if decay_consts is None:
+            decay_consts = np.array([iso.decay_const for iso in isotopes.values()], dtype=float)
+        self.half_life_seconds = half_life_seconds
+        self.decay_consts = decay_consts
+
+    # the secondary indexes touch every isotope, so they are only built for callers that use them
+
+    @cached_property
+    def by_short_name(self):
+        return {iso.short_name: iso for iso in self.isotopes.values()}
+
+    @cached_property
+    def by_atomic_number(self):
+        index = defaultdict(list)
+        for iso in self.isotopes.values():
+            index[iso.atomic_number].append(iso)
+        return index
+
+    @cached_property
+    def by_decay_mode(self):
+        index = defaultdict(list)
+        for iso in self.isotopes.values():
+            index[iso.decay_mode].append(iso)
+        return index
+
+    @classmethod
+    def from_json(cls, filepath=DATA_PATH):
+        return cls(load_unstable_isotopes(filepath))
+
+    @classmethod
+    def from_snapshot(cls, snapshot_path=SNAPSHOT_PATH):
+        isotopes, records = load_snapshot(snapshot_path)
+        return cls(isotopes, half_life_seconds=records['half_life_seconds'], decay_consts=records['decay_const'])
+
+    def get(self, key):
+        """
+        Look up an isotope by short name, case-insensitively (e.g. "U-238" or "u-238").
+
+        Returns:
+            (Isotope) the isotope, or None if it is not in the dataset
+        """
+        return self.isotopes.get(key.strip().lower())
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __len__(self):
+        return len(self.isotopes)
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_registry():
+    """
+    Return the process-wide isotope registry, loading the dataset on first use. A compiled snapshot
+    is memory-mapped when one exists and is at least as new as the JSON dataset.
+    """
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                if is_snapshot_current():
+                    _registry = IsotopeRegistry.from_snapshot()
+                else:
+                    _registry = IsotopeRegistry.from_json()
+    return _registry
@@ -0,0 +1,163 @@
+"""Compiles the isotope JSON dataset into a columnar binary snapshot and loads it memory-mapped.
+
+Build with `python -m app.utils.isotope_snapshot [json_path] [snapshot_path]`."""
+
+import sys
+import numpy as np
+from collections.abc import Mapping
+from pathlib import Path
+
+from .isotope_loader import DATA_PATH, load_unstable_isotopes
+from ..static.models.isotopes import Isotope
+
+SNAPSHOT_PATH = DATA_PATH.with_suffix('.npy')
+
+STRING_FIELDS = ('key', 'name', 'half_life_unit', 'short_name', 'decay_mode', 'daughter')
+
+# each string field is an (offset, length) pair into the string table; length -1 marks a missing value
+SNAPSHOT_DTYPE = np.dtype(
+    [
+        ('half_life', '<f8'),
+        ('half_life_seconds', '<f8'),
+        ('decay_const', '<f8'),
+        ('gamma_emission_probability', '<f8'),
+        ('atomic_number', '<i4'),
+    ]
+    + [(field, '<i4', (2,)) for field in STRING_FIELDS]
+)
+
+def strings_path(snapshot_path):
+    snapshot_path = Path(snapshot_path)
+    return snapshot_path.with_name(snapshot_path.stem + '.strings.npy')
+
+
+def build_snapshot(json_path=DATA_PATH, snapshot_path=SNAPSHOT_PATH):
+    """
+    Compile the JSON dataset into a structured record array plus a UTF-8 string table.
+
+    Returns:
+        (int) number of isotopes written
+    """
+    isotopes = load_unstable_isotopes(json_path)
+
+    records = np.zeros(len(isotopes), dtype=SNAPSHOT_DTYPE)
+    table = bytearray()
+
+    # keys go first so they form one contiguous prefix of the string table
+    for i, key in enumerate(isotopes):
+        encoded = key.encode()
+        records[i]['key'] = (len(table), len(encoded))
+        table += encoded
+
+    for i, iso in enumerate(isotopes.values()):
+        records[i]['half_life'] = iso.half_life
+        records[i]['half_life_seconds'] = iso.half_life_seconds
+        records[i]['decay_const'] = iso.decay_const
+        records[i]['gamma_emission_probability'] = iso.gamma_emission_probability
+        records[i]['atomic_number'] = -1 if iso.atomic_number is None else iso.atomic_number
+
+        for field in STRING_FIELDS[1:]:
+            value = getattr(iso, field)
+            if value is None:
+                records[i][field] = (0, -1)
+                continue
+            encoded = str(value).encode()
+            records[i][field] = (len(table), len(encoded))
+            table += encoded
+
+    np.save(snapshot_path, records)
+    np.save(strings_path(snapshot_path), np.frombuffer(bytes(table), dtype=np.uint8))
+    return len(records)
+
+
+def is_snapshot_current(json_path=DATA_PATH, snapshot_path=SNAPSHOT_PATH):
+    snapshot_path = Path(snapshot_path)
+    if not snapshot_path.exists() or not strings_path(snapshot_path).exists():
+        return False
+    return snapshot_path.stat().st_mtime >= Path(json_path).stat().st_mtime
+
+
+def map_array(path, dtype):
+    """
+    Memory-map a 1-D .npy file whose dtype is already known. np.load parses the header text on
+    every call, which costs more than mapping the whole snapshot; only its length is read here.
+
+    Returns:
+        (np.memmap) read-only array
+    """
+    with open(path, 'rb') as f:
+        major, _ = np.lib.format.read_magic(f)
+        length_size = 2 if major == 1 else 4             # version 1 headers store their length in 2 bytes
+        offset = f.tell() + length_size + int.from_bytes(f.read(length_size), 'little')
+    return np.memmap(path, dtype=dtype, mode='r', offset=offset)
+
+
+class SnapshotIsotopes(Mapping):
+    """
+    Read-only mapping of lower-case short name -> Isotope over a memory-mapped snapshot. Only the
+    key column is decoded up front; an Isotope is built from its row the first time it is looked up.
+    """
+
+    def __init__(self, records, table):
+        self.records = records
+        self.table = table
+        key_spans = records['key'].tolist()
+        keys = table[:key_spans[-1][0] + key_spans[-1][1]].tobytes() if key_spans else b''
+        self.index = {keys[offset:offset + length].decode(): i for i, (offset, length) in enumerate(key_spans)}
+        self._built = {}
+
+    def read(self, field, i):
+        offset, length = self.records[field][i]
+        return None if length < 0 else self.table[offset:offset + length].tobytes().decode()
+
+    def isotope(self, i):
+        atomic_number = int(self.records['atomic_number'][i])
+        return Isotope(
+            name=self.read('name', i),
+            half_life=float(self.records['half_life'][i]),
+            gamma_emission_probability=float(self.records['gamma_emission_probability'][i]),
+            half_life_unit=self.read('half_life_unit', i),
+            short_name=self.read('short_name', i),
+            atomic_number=None if atomic_number < 0 else atomic_number,
+            decay_mode=self.read('decay_mode', i),
+            daughter=self.read('daughter', i),
+            half_life_seconds=float(self.records['half_life_seconds'][i]),
+            decay_const=float(self.records['decay_const'][i])
+        )
+
+    def __getitem__(self, key):
+        isotope = self._built.get(key)
+        if isotope is None:
+            # concurrent first lookups may both build the row; either result is equivalent
+            isotope = self._built[key] = self.isotope(self.index[key])
+        return isotope
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, key):
+        return key in self.index
+
+
+def load_snapshot(snapshot_path=SNAPSHOT_PATH):
+    """
+    Memory-map a snapshot. The columns stay backed by the file, so forked workers share its pages,
+    and Isotope objects are only built for the rows that are looked up.
+
+    Returns:
+        (SnapshotIsotopes) lower-case short name -> Isotope
+        (np.ndarray) memory-mapped structured records in the same order
+    """
+    records = map_array(snapshot_path, SNAPSHOT_DTYPE)
+    table = map_array(strings_path(snapshot_path), np.uint8)
+    return SnapshotIsotopes(records, table), records
+
+
+if __name__ == '__main__':
+    json_path = sys.argv[1] if len(sys.argv) > 1 else DATA_PATH
+    snapshot_path = sys.argv[2] if len(sys.argv) > 2 else SNAPSHOT_PATH
+    count = build_snapshot(json_path, snapshot_path)
+    print(f"Wrote {count} isotopes to {snapshot_path}")
@@ -0,0 +1,89 @@
+"""Background executor for long-running simulations with a bounded, expiring result store."""
+
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    status: str = 'queued'                  # queued, running, done or failed
+    submitted_at: float = field(default_factory=time.time)
+    started_at: float = None
+    finished_at: float = None
+    result: object = None
+    error: str = None
+
+    def describe(self):
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'submitted_at': self.submitted_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'error': self.error
+        }
+
+
+class JobQueue:
+    """
+    Runs submitted callables on a thread pool and keeps their results for `ttl` seconds. At most
+    `max_jobs` jobs are tracked; when full, the oldest finished jobs are dropped first.
+    """
+
+    def __init__(self, workers=2, max_jobs=256, ttl=600):
+        self.max_jobs = max_jobs
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='simulation-job')
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, kind, fn, *args, **kwargs):
+        """
+        Queue `fn(*args, **kwargs)` for background execution.
+
+        Returns:
+            (Job) the queued job, or None if the store is full of unfinished jobs
+        """
+        job = Job(id=uuid.uuid4().hex, kind=kind)
+        with self._lock:
+            self._evict()
+            if len(self._jobs) >= self.max_jobs:
+                return None
+            self._jobs[job.id] = job
+
+        self._executor.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            self._evict()
+            return self._jobs.get(job_id)
+
+    def _run(self, job, fn, args, kwargs):
+        job.status = 'running'
+        job.started_at = time.time()
+        try:
+            job.result = fn(*args, **kwargs)
+            job.status = 'done'
+        except Exception as e:
+            job.error = str(e)
+            job.status = 'failed'
+        job.finished_at = time.time()
+
+    def _evict(self):
+        now = time.time()
+        finished = [job for job in self._jobs.values() if job.finished_at is not None]
+
+        for job in finished:
+            if now - job.finished_at > self.ttl:
+                del self._jobs[job.id]
+
+        finished = [job for job in finished if job.id in self._jobs]
+        while len(self._jobs) >= self.max_jobs and finished:
+            del self._jobs[finished.pop(0).id]
@@ -0,0 +1,107 @@
+"""Low-overhead request stage timing, exposed as Server-Timing headers and Prometheus text metrics."""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Histogram:
+    """
+    Cumulative-bucket histogram keyed by label values. Observing is a bisect and three additions
+    under a lock, cheap enough to run on every request.
+    """
+
+    def __init__(self, name, description, labels, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self.buckets = buckets
+        self._series = {}                          # label values -> [bucket counts, sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][idx] += 1
+            series[1] += value
+            series[2] += 1
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+    def expose(self):
+        """
+        Returns:
+            (list) lines of the Prometheus text exposition format for this histogram
+        """
+        with self._lock:
+            snapshot = {key: (list(counts), total, count) for key, (counts, total, count) in self._series.items()}
+
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        for label_values, (counts, total, count) in sorted(snapshot.items()):
+            labels = ','.join(f'{name}="{escape_label(value)}"' for name, value in zip(self.labels, label_values))
+            prefix = f"{labels}," if labels else ''
+
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound:g}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {count}')
+            lines.append(f'{self.name}_sum{{{labels}}} {total:.9g}')
+            lines.append(f'{self.name}_count{{{labels}}} {count}')
+        return lines
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+STAGE_SECONDS = Histogram(
+    'simulate_stage_seconds', 'Time spent in each stage of a /simulate request.', labels=('stage',)
+)
+REQUEST_SECONDS = Histogram(
+    'simulate_request_seconds', 'Total /simulate handling time per isotope.', labels=('isotope',)
+)
+
+def render_metrics():
+    return '\n'.join(STAGE_SECONDS.expose() + REQUEST_SECONDS.expose()) + '\n'
+
+
+class StageTimer:
+    """
+    Times the named stages of one request. Stages are recorded in order, reported as a
+    Server-Timing header, and added to the stage histogram when the request finishes.
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.stages = []                            # (name, seconds)
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append((name, time.perf_counter() - start))
+
+    def finish(self, isotope):
+        """
+        Record the stages and total time in the histograms.
+
+        Returns:
+            (str) Server-Timing header value, durations in milliseconds
+        """
+        total = time.perf_counter() - self.start
+        for name, seconds in self.stages:
+            STAGE_SECONDS.observe(seconds, name)
+        REQUEST_SECONDS.observe(total, isotope)
+
+        timings = self.stages + [('total', total)]
+        return ', '.join(f"{name};dur={seconds * 1e3:.3f}" for name, seconds in timings)
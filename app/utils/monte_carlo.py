@@ -0,0 +1,98 @@
+"""Exact stochastic decay of discrete atoms, simulated as vectorized ensembles of independent runs."""
+
+import numpy as np
+
+from .rng import spawn_seeds
+
+METHODS = ('binomial', 'poisson')
+POISSON_NORMAL_CUTOFF = 1e12             # above this mean a Poisson draw is replaced by its normal limit
+MAX_BINOMIAL_ATOMS = np.iinfo(np.int64).max     # multinomial draws take an int64 count
+ENSEMBLE_BLOCK_RUNS = 256                # runs drawn from each child seed, independent of the worker count
+
+def interval_decay_probabilities(decay_const, time_pts):
+    """
+    Probability that an atom present at t=0 decays in each interval (t[k-1], t[k]], with t[-1] = 0.
+    The final entry is the probability it survives past the last time point.
+
+    Returns:
+        (np.ndarray) probabilities with shape (time + 1,) summing to 1
+    """
+    survival = np.concatenate(([1.0], np.exp(-decay_const * np.asarray(time_pts, dtype=float))))
+    return np.append(np.maximum(survival[:-1] - survival[1:], 0), survival[-1])
+
+
+def sample_ensemble(init_atoms, decay_const, time_pts, runs, rng, method='binomial'):
+    """
+    Simulate `runs` independent realizations of a decaying sample of `init_atoms` atoms.
+
+    'binomial' is exact: each step thins the surviving atoms binomially with the interval's decay
+    probability, which for all steps at once is one multinomial draw per run over the intervals.
+    'poisson' replaces each step's binomial with a Poisson draw of the same mean, conditioned on the
+    atoms left after the previous step; it is accurate when steps are short relative to the half-life
+    and keeps working for atom counts too large for integer sampling, so 'binomial' falls back to it
+    above `MAX_BINOMIAL_ATOMS`. Fractional amounts are rounded to the nearest whole atom.
+
+    Returns:
+        (np.ndarray) remaining atoms with shape (runs, time)
+    """
+    atoms = round(init_atoms)
+    if method == 'binomial' and atoms <= MAX_BINOMIAL_ATOMS:
+        probabilities = interval_decay_probabilities(decay_const, time_pts)
+        decays = rng.multinomial(atoms, probabilities, size=runs)[:, :-1]
+        return atoms - np.cumsum(decays, axis=1)
+
+    steps = np.diff(np.asarray(time_pts, dtype=float), prepend=0.0)
+    step_probabilities = -np.expm1(-decay_const * steps)
+
+    remaining = np.empty((runs, steps.size))
+    surviving = np.full(runs, float(atoms))
+    for k, probability in enumerate(step_probabilities):
+        surviving -= np.clip(draw_poisson(rng, surviving * probability), 0, surviving)
+        remaining[:, k] = surviving
+    return remaining
+
+
+def ensemble_blocks(runs, block_runs=ENSEMBLE_BLOCK_RUNS):
+    """
+    Returns:
+        (list) consecutive (start, stop) run ranges of at most `block_runs` runs covering all `runs`
+    """
+    return [(start, min(start + block_runs, runs)) for start in range(0, runs, block_runs)]
+
+
+def sample_ensemble_blocks(init_atoms, decay_const, time_pts, runs, seed, method='binomial'):
+    """
+    Simulate an ensemble block by block, block i drawing from child i of `seed`. A parallel run
+    hands the same blocks and seeds to its workers, so both produce identical runs for any
+    worker count.
+
+    Returns:
+        (np.ndarray) remaining atoms with shape (runs, time)
+    """
+    blocks = ensemble_blocks(runs)
+    remaining = np.empty((runs, np.size(time_pts)))
+    for (start, stop), child in zip(blocks, spawn_seeds(seed, len(blocks))):
+        remaining[start:stop] = sample_ensemble(init_atoms, decay_const, time_pts, stop - start,
+                                                np.random.default_rng(child), method)
+    return remaining
+
+
+def draw_poisson(rng, mean):
+    large = mean > POISSON_NORMAL_CUTOFF
+    draws = rng.poisson(np.where(large, 0, mean)).astype(float)
+    draws[large] = rng.normal(mean[large], np.sqrt(mean[large]))
+    return draws
+
+
+def ensemble_statistics(remaining, percentiles=(5, 50, 95)):
+    """
+    Per time point statistics across the runs of an ensemble.
+
+    Returns:
+        (dict) 'mean' and 'variance' arrays, plus one array per requested percentile under 'percentiles'
+    """
+    return {
+        'mean': remaining.mean(axis=0),
+        'variance': remaining.var(axis=0),
+        'percentiles': dict(zip(percentiles, np.percentile(remaining, percentiles, axis=0)))
+    }
@@ -0,0 +1,140 @@
+"""Runs large stochastic decay ensembles across a process pool, writing runs into shared memory."""
+
+import os
+import threading
+import multiprocessing
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.shared_memory import SharedMemory
+
+from .monte_carlo import ensemble_blocks, sample_ensemble
+from .rng import spawn_seeds
+
+
+def ensemble_block(shm_name, shape, start, stop, init_atoms, decay_const, time_pts, seed, method, bin_edges):
+    """
+    Simulate block [start, stop) of an ensemble into the shared output array and summarize it.
+
+    Returns:
+        (int) number of runs in the block
+        (np.ndarray) mean per time point
+        (np.ndarray) sum of squared deviations from that mean per time point
+        (np.ndarray) histogram counts with shape (time, bins)
+    """
+    shm = SharedMemory(name=shm_name)
+    try:
+        remaining = np.ndarray(shape, dtype=float, buffer=shm.buf)
+        block = sample_ensemble(init_atoms, decay_const, time_pts, stop - start, np.random.default_rng(seed), method)
+        remaining[start:stop] = block
+
+        mean = block.mean(axis=0)
+        m2 = ((block - mean) ** 2).sum(axis=0)
+        histogram = time_histogram(block, bin_edges)
+        del remaining
+    finally:
+        shm.close()
+
+    return stop - start, mean, m2, histogram
+
+
+def time_histogram(block, bin_edges):
+    """
+    Histogram every time point's column of a (runs, time) block over shared bin edges, so block
+    histograms can be merged by adding them.
+
+    Returns:
+        (np.ndarray) counts with shape (time, bins)
+    """
+    bins = bin_edges.size - 1
+    idx = np.clip(np.searchsorted(bin_edges, block, side='right') - 1, 0, bins - 1)
+    flat = idx + np.arange(block.shape[1]) * bins
+    return np.bincount(flat.ravel(), minlength=block.shape[1] * bins).reshape(block.shape[1], bins)
+
+
+def merge_moments(count_a, mean_a, m2_a, count_b, mean_b, m2_b):
+    """
+    Combine the count, mean and sum of squared deviations of two partitions (Chan et al.).
+    """
+    count = count_a + count_b
+    delta = mean_b - mean_a
+    mean = mean_a + delta * (count_b / count)
+    m2 = m2_a + m2_b + delta ** 2 * (count_a * count_b / count)
+    return count, mean, m2
+
+
+_pools = {}                                 # worker count -> pool
+_pool_lock = threading.Lock()
+
+def get_pool(workers):
+    """
+    Return the shared pool with `workers` processes, creating it on first use. Pools are never shut
+    down here, since another request thread may still be submitting to one.
+    """
+    with _pool_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            # spawn avoids forking a multi-threaded server process
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            _pools[workers] = pool
+        return pool
+
+
+def run_ensemble_parallel(sim, runs, method='binomial', workers=None, percentiles=(5, 50, 95), bins=50, keep_runs=False):
+    """
+    Simulate an ensemble for a DecaySimulation with its runs split into the fixed-size blocks of
+    `ensemble_blocks`, which the pool's workers take in turn. Block i draws from child i of the
+    simulation's seed, so the runs match `DecaySimulation.simulate_ensemble` for any worker count.
+    Blocks write straight into a shared-memory (runs, time) array; only small per-block summaries
+    travel back, merged as blocks finish.
+
+    Args:
+        sim (DecaySimulation): simulation providing the atoms, decay constant, time grid and seed
+        runs (int): number of independent realizations
+        method (str): 'binomial' or 'poisson', see `sample_ensemble`
+        workers (int): process count, defaults to the CPU count
+        percentiles (tuple): percentiles to report per time point
+        bins (int): histogram bins spanning 0 to the initial amount
+        keep_runs (bool): also return a copy of the full (runs, time) array
+
+    Returns:
+        (dict) 'mean', 'variance', 'percentiles' as in `ensemble_statistics`, plus 'histogram',
+        'bin_edges' and, when requested, 'runs'
+    """
+    workers = workers or os.cpu_count()
+    shape = (runs, sim.time_pts.size)
+    blocks = ensemble_blocks(runs)
+    seeds = spawn_seeds(sim.seed, len(blocks))
+    bin_edges = np.linspace(0, sim.init_amt, bins + 1)
+
+    shm = SharedMemory(create=True, size=max(int(np.prod(shape)) * 8, 1))
+    try:
+        pool = get_pool(workers)
+        futures = [
+            pool.submit(ensemble_block, shm.name, shape, start, stop,
+                        sim.init_amt, sim.decay_const, sim.time_pts, seed, method, bin_edges)
+            for (start, stop), seed in zip(blocks, seeds)
+        ]
+
+        count, mean, m2 = 0, np.zeros(shape[1]), np.zeros(shape[1])
+        histogram = np.zeros((shape[1], bins), dtype=np.int64)
+        for future in as_completed(futures):
+            block_count, block_mean, block_m2, block_histogram = future.result()
+            count, mean, m2 = merge_moments(count, mean, m2, block_count, block_mean, block_m2)
+            histogram += block_histogram
+
+        remaining = np.ndarray(shape, dtype=float, buffer=shm.buf)
+        result = {
+            'mean': mean,
+            'variance': m2 / count,
+            'percentiles': dict(zip(percentiles, np.percentile(remaining, percentiles, axis=0))),
+            'histogram': histogram,
+            'bin_edges': bin_edges
+        }
+        if keep_runs:
+            result['runs'] = remaining.copy()
+        del remaining
+    finally:
+        shm.close()
+        shm.unlink()
+
+    return result
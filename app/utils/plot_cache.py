@@ -0,0 +1,60 @@
+"""In-memory LRU cache for rendered decay plots, bounded by total image size."""
+
+import threading
+from collections import OrderedDict
+
+class PlotCache:
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Look up a rendered plot and mark it as most recently used.
+
+        Returns:
+            (bytes) cached PNG, or None on a miss
+        """
+        with self._lock:
+            png = self._entries.get(key)
+            if png is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return png
+
+    def put(self, key, png):
+        with self._lock:
+            if len(png) > self.max_bytes:
+                return
+
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size_bytes -= len(old)
+
+            self._entries[key] = png
+            self.size_bytes += len(png)
+
+            while self.size_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size_bytes -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'size_bytes': self.size_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses
+            }
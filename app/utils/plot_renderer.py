@@ -0,0 +1,205 @@
+"""Pre-styled decay plot figures that are reused across requests and rendered through an explicit Agg canvas."""
+
+import io
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from ..static.css.plot_colors import *
+
+# key in DecaySimulation.graph, legend label, color and matplotlib line style of each plotted series
+SERIES_STYLES = (
+    ('remaining', 'Remaining Material', cyan, '-'),
+    ('decayed', 'Decayed Material', coral, '--'),
+    ('gamma', 'Gamma Decay', yellow, ':'),
+)
+HALF_LIFE_STYLE = ('hl', 'First Half-Life', white, '--')
+
+class DecayPlotTemplate:
+    """
+    A styled figure with one artist per plotted series. Drawing a simulation only swaps line data,
+    visibility and labels, so the figure, axes, spines and grid are built once per pooled template.
+    """
+
+    def __init__(self):
+        self.figure = Figure(figsize=(10, 6))
+        FigureCanvasAgg(self.figure)
+        self.figure.patch.set_facecolor(table_grey)
+
+        ax1 = self.figure.add_subplot()
+        ax1.set_facecolor(table_grey)
+        ax1.set_ylabel('Amount of Material', color=white)
+        ax1.tick_params(colors=white)
+        ax1.grid(True, color=grey_400, alpha=0.2)
+
+        ax2 = ax1.twinx()
+        ax2.set_ylabel('Activity (Bq)', color=grey_400)
+        ax2.tick_params(colors=grey_400)
+
+        for spine in ax1.spines.values():
+            spine.set_color(white)
+        for spine in ax2.spines.values():
+            spine.set_color(grey_400)
+
+        self.ax1 = ax1
+        self.ax2 = ax2
+        self.remaining_line, self.decayed_line, self.gamma_line = (
+            ax1.plot([], [], color=color, marker='.', linestyle=linestyle, label=label)[0]
+            for _, label, color, linestyle in SERIES_STYLES
+        )
+        _, label, color, linestyle = HALF_LIFE_STYLE
+        self.hl_line = ax1.axvline(x=0, color=color, linestyle=linestyle, label=label)
+        self.title = ax1.set_title('', color=white)
+        self.subplot_params = vars(self.figure.subplotpars).copy()
+
+    def draw(self, sim, series):
+        """
+        Update the template's artists with a simulation's series.
+
+        Args:
+            sim (DecaySimulation): simulation providing labels and selected graphs
+            series (tuple): output of `DecaySimulation.calc_series`
+
+        Returns:
+            (Figure) the template's figure, valid until the next draw on this template
+        """
+        amt_decayed, _, amt_remaining, gamma_decay = series
+
+        lines = (
+            (self.remaining_line, amt_remaining, 'remaining'),
+            (self.decayed_line, amt_decayed, 'decayed'),
+            (self.gamma_line, gamma_decay, 'gamma'),
+        )
+        for line, values, name in lines:
+            line.set_visible(name in sim.graph)
+            line.set_data(sim.time_pts, values)
+
+        self.hl_line.set_visible('hl' in sim.graph)
+        self.hl_line.set_xdata([sim.half_life, sim.half_life])
+
+        self.ax1.set_xlabel(f'Time ({sim.half_life_unit})', color=white)
+        self.title.set_text(f'Radioactive Decay Simulation for {sim.isotope_name}')
+
+        self.ax1.relim(visible_only=True)
+        self.ax1.autoscale_view()
+
+        handles = [artist for artist in (self.remaining_line, self.decayed_line, self.gamma_line, self.hl_line)
+                   if artist.get_visible()]
+        self.ax1.legend(handles, [h.get_label() for h in handles],
+                        loc='best', facecolor=table_grey, labelcolor=white)
+
+        # lay out from the same starting geometry every time so reused figures match fresh ones
+        self.figure.subplots_adjust(**self.subplot_params)
+        self.figure.tight_layout()
+        return self.figure
+
+
+def plot_spec(sim):
+    """
+    Describe the decay plot without rendering it, so a browser can draw the same chart from the
+    numeric series: labels, theme colors, and the style and visibility of every series.
+
+    Returns:
+        (dict) JSON-serializable plot description
+    """
+    key, label, color, linestyle = HALF_LIFE_STYLE
+    return {
+        'title': f'Radioactive Decay Simulation for {sim.isotope_name}',
+        'x_label': f'Time ({sim.half_life_unit})',
+        'y_label': 'Amount of Material',
+        'colors': {
+            'background': to_css(table_grey),
+            'text': to_css(white),
+            'grid': to_css(grey_400)
+        },
+        'series': [
+            {'key': key, 'label': label, 'color': to_css(color), 'linestyle': linestyle, 'visible': key in sim.graph}
+            for key, label, color, linestyle in SERIES_STYLES
+        ],
+        'half_life': {
+            'x': sim.half_life, 'label': label, 'color': to_css(color),
+            'linestyle': linestyle, 'visible': key in sim.graph
+        }
+    }
+
+
+class TemplatePool:
+    """
+    Idle plot templates shared by every request thread. The threaded server starts a new thread
+    per request, so templates are lent out per render rather than tied to a thread. A borrower has
+    the template to itself until it gives it back; a new one is built only when every template is
+    in use, and at most `max_idle` are kept.
+    """
+
+    def __init__(self, max_idle=4):
+        self.max_idle = max_idle
+        self._idle = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def borrow(self):
+        with self._lock:
+            template = self._idle.pop() if self._idle else None
+        if template is None:
+            template = DecayPlotTemplate()
+
+        try:
+            yield template
+        finally:
+            with self._lock:
+                if len(self._idle) < self.max_idle:
+                    self._idle.append(template)
+
+
+TEMPLATES = TemplatePool(max_idle=int(os.environ.get('PLOT_TEMPLATE_POOL_SIZE', 4)))
+
+def borrow_template():
+    """
+    Borrow a plot template for one draw and serialization:
+
+        with borrow_template() as template:
+            png = figure_to_png(sim.plot_decay(series, template))
+    """
+    return TEMPLATES.borrow()
+
+
+def figure_to_png(fig):
+    """
+    Serialize a figure through its own canvas, without touching pyplot state.
+
+    Returns:
+        (bytes) PNG image
+    """
+    img = io.BytesIO()
+    fig.savefig(img, format='png', bbox_inches='tight')
+    return img.getvalue()
+
+
+def render_worker(sim, series):
+    with borrow_template() as template:
+        return figure_to_png(sim.plot_decay(series, template))
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def render_in_pool(sim, series, workers):
+    """
+    Render a simulation's plot in a process pool so PNG generation runs across cores instead of
+    being serialized by the GIL. The pool is created on first use and shared by all request threads.
+
+    Returns:
+        (bytes) PNG image
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn avoids forking a multi-threaded server process
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
+    return _pool.submit(render_worker, sim, series).result()
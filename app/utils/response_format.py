@@ -0,0 +1,50 @@
+"""Encodes simulation series as compact columnar payloads for API responses."""
+
+import base64
+import numpy as np
+
+ENCODINGS = ('json', 'base64')
+DTYPES = {
+    'float32': '<f4',
+    'float64': '<f8'
+}
+
+def is_format_valid(encoding, dtype):
+    return encoding in ENCODINGS and dtype in DTYPES
+
+
+def encode_columns(columns, encoding='json', dtype='float64'):
+    """
+    Encode named series as one array per column instead of one object per time point.
+
+    Args:
+        columns (dict): column name to array; every array must have the same shape
+        encoding (str): 'json' for plain numbers or 'base64' for raw little-endian buffers
+        dtype (str): 'float32' or 'float64', used for base64 buffers
+
+    Returns:
+        (dict) payload with the encoding metadata, shape and encoded columns
+    """
+    arrays = {name: np.asarray(values) for name, values in columns.items()}
+    shape = next(iter(arrays.values())).shape
+
+    if encoding == 'base64':
+        encoded = {
+            name: base64.b64encode(np.ascontiguousarray(values, dtype=DTYPES[dtype]).tobytes()).decode()
+            for name, values in arrays.items()
+        }
+        return {
+            'format': 'columnar',
+            'encoding': 'base64',
+            'dtype': dtype,
+            'byteorder': 'little',
+            'shape': list(shape),
+            'columns': encoded
+        }
+
+    return {
+        'format': 'columnar',
+        'encoding': 'json',
+        'shape': list(shape),
+        'columns': {name: values.tolist() for name, values in arrays.items()}
+    }
@@ -0,0 +1,33 @@
+"""Builds reproducible random number generators and independent child streams for parallel work."""
+
+import numpy as np
+
+def make_rng(seed=None):
+    """
+    Accepts None (fresh OS entropy), an int, a SeedSequence or an existing Generator, which is used as is.
+
+    Returns:
+        (np.random.Generator) generator for the seed
+    """
+    if isinstance(seed, np.random.Generator):
+        return seed
+    return np.random.default_rng(seed)
+
+
+def spawn_seeds(seed, n):
+    """
+    Split a seed into `n` statistically independent child seed sequences. The children are picklable,
+    so block i of a parallel run gets the same stream no matter which worker process executes it.
+
+    Returns:
+        (list) `n` np.random.SeedSequence objects
+    """
+    if isinstance(seed, np.random.Generator):
+        return seed.bit_generator.seed_seq.spawn(n)
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return seed.spawn(n)
+
+
+def spawn_rngs(seed, n):
+    return [np.random.default_rng(child) for child in spawn_seeds(seed, n)]
@@ -0,0 +1,87 @@
+"""Time grid strategies: uniform, logarithmic, and adaptive refinement to an interpolation tolerance."""
+
+import numpy as np
+
+GRID_STRATEGIES = ('linear', 'log', 'adaptive')
+MIN_GRID_POINTS = {'linear': 2, 'log': 3, 'adaptive': 2}      # log grids need t=0 plus two log-spaced points
+INITIAL_ADAPTIVE_POINTS = 9
+
+def linear_grid(max_time, time_points):
+    return np.linspace(0, max_time, time_points)
+
+
+def log_grid(max_time, time_points, min_time):
+    """
+    t=0 followed by points evenly spaced in log time from `min_time` to `max_time`, so every
+    decade gets the same number of points.
+    """
+    if time_points < MIN_GRID_POINTS['log']:
+        raise ValueError(f"A log grid needs at least {MIN_GRID_POINTS['log']} points to reach max_time.")
+    return np.concatenate(([0.0], np.geomspace(min_time, max_time, time_points - 1)))
+
+
+def adaptive_grid(curve, max_time, max_points, tolerance=1e-3, min_time=None):
+    """
+    Refine a coarse grid by bisection until straight lines between neighbouring points reproduce
+    `curve` to within `tolerance`. Each round evaluates the curve at every interval midpoint and
+    splits only the intervals whose midpoint misses the chord, so points collect where the curve
+    bends and the flat tail stays sparse.
+
+    Args:
+        curve (callable): maps a 1-D array of times to values with shape (time,) or (series, time)
+        max_time (float): end of the grid
+        max_points (int): refinement stops before the grid would exceed this many points
+        tolerance (float): allowed interpolation error, relative to each series' largest magnitude
+        min_time (float, optional): shortest timescale of interest; seeds the grid with log-spaced
+            points down to it so features far shorter than `max_time` are not stepped over
+
+    Returns:
+        (np.ndarray) sorted time points starting at 0 and ending at `max_time`
+    """
+    time_pts = np.linspace(0, max_time, min(INITIAL_ADAPTIVE_POINTS, max_points))
+    if min_time is not None and max_points > time_pts.size:
+        seed_points = min(INITIAL_ADAPTIVE_POINTS, max_points - time_pts.size)
+        time_pts = np.union1d(time_pts, np.geomspace(min_time, max_time, seed_points))
+
+    values = np.atleast_2d(curve(time_pts))
+    scale = np.abs(values).max(axis=1, keepdims=True)
+    scale[scale == 0] = 1
+
+    while True:
+        midpoints = (time_pts[:-1] + time_pts[1:]) / 2
+        chord = (values[:, :-1] + values[:, 1:]) / 2
+        error = (np.abs(np.atleast_2d(curve(midpoints)) - chord) / scale).max(axis=0)
+
+        # intervals that have shrunk to floating point resolution cannot be split further
+        split = (error > tolerance) & (midpoints > time_pts[:-1]) & (midpoints < time_pts[1:])
+        if not split.any():
+            return time_pts
+
+        budget = max_points - time_pts.size
+        if budget <= 0:
+            return time_pts
+        if split.sum() > budget:
+            # spend what is left on the worst intervals
+            split[np.argsort(np.where(split, error, -np.inf))[:-budget]] = False
+
+        time_pts = np.sort(np.concatenate((time_pts, midpoints[split])))
+        values = np.atleast_2d(curve(time_pts))
+
+
+def build_time_grid(strategy, max_time, time_points, curve=None, tolerance=1e-3, min_time=None):
+    """
+    Build a time grid with one of `GRID_STRATEGIES`. For 'adaptive', `time_points` is the most
+    points the grid may use; it usually needs far fewer.
+
+    Returns:
+        (np.ndarray) time points from 0 to `max_time`
+    """
+    if strategy == 'linear':
+        return linear_grid(max_time, time_points)
+    if min_time is None:
+        min_time = max_time * 1e-4
+    if strategy == 'log':
+        return log_grid(max_time, time_points, min_time)
+    if strategy == 'adaptive':
+        return adaptive_grid(curve, max_time, time_points, tolerance, min_time)
+    raise ValueError(f"Unknown time grid strategy '{strategy}'.")
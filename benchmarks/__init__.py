@@ -0,0 +1 @@
+"""Performance benchmarks for the simulation, rendering, data loading and HTTP paths."""
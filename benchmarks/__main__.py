@@ -0,0 +1,55 @@
+"""
+Command line entry point.
+
+    python -m benchmarks run [--quick] [--filter NAME] [--output results.json | --save-baseline]
+    python -m benchmarks compare [baseline.json] [results.json] [--threshold 0.2]
+"""
+
+import sys
+import argparse
+
+from .cases import all_benchmarks
+from .runner import compare_results, load_results, run_benchmarks, save_results
+
+BASELINE_PATH = 'benchmarks/baseline.json'
+RESULTS_PATH = 'benchmarks/results.json'
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='run the benchmarks and save the results')
+    run.add_argument('--quick', action='store_true', help='a fifth of the iterations, for smoke runs')
+    run.add_argument('--filter', help='only run benchmarks whose name contains this text')
+    # plain runs never touch the baseline, which is only replaced on request
+    output = run.add_mutually_exclusive_group()
+    output.add_argument('--output', default=RESULTS_PATH, help=f'results file (default {RESULTS_PATH})')
+    output.add_argument('--save-baseline', action='store_true', help=f'save the results as {BASELINE_PATH}')
+
+    compare = commands.add_parser('compare', help='flag regressions between two result files')
+    compare.add_argument('baseline', nargs='?', default=BASELINE_PATH)
+    compare.add_argument('current', nargs='?', default=RESULTS_PATH)
+    compare.add_argument('--threshold', type=float, default=0.2, help='allowed relative growth (default 0.2 = 20%%)')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        results = run_benchmarks(all_benchmarks(), quick=args.quick, pattern=args.filter)
+        output = BASELINE_PATH if args.save_baseline else args.output
+        save_results(results, output)
+        print(f"Saved {len(results['results'])} results to {output}")
+        return 0
+
+    rows = compare_results(load_results(args.baseline), load_results(args.current), args.threshold)
+    for row in rows:
+        flag = 'REGRESSION' if row['regression'] else ''
+        print(f"{row['name']:<70} {row['metric']:<16} {row['baseline']:12.3f} -> {row['current']:12.3f} "
+              f"{row['change']:+8.1%} {flag}")
+
+    regressions = [row for row in rows if row['regression']]
+    print(f"{len(regressions)} regression(s) over {args.threshold:.0%} in {len(rows)} comparisons")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""Benchmark cases sweeping time points, noise and plotted series over the app's hot paths."""
+
+import tempfile
+import numpy as np
+
+from pathlib import Path
+from .runner import Benchmark
+
+TIME_POINTS = (100, 1_000, 10_000, 100_000)
+PLOT_TIME_POINTS = (100, 1_000)
+HTTP_TIME_POINTS = (50, 1_000)                  # /simulate accepts at most 1000 points
+NOISE_LEVELS = (0, 5)
+GRAPHS = {
+    'remaining': ['remaining'],
+    'all': ['remaining', 'decayed', 'gamma', 'hl']
+}
+
+def make_simulation(time_points, noise=0, graph=GRAPHS['all']):
+    from app.utils.decay_simulator import DecaySimulation
+
+    return DecaySimulation(
+        init_amt=1000,
+        half_life=8.02,
+        time_pts=np.linspace(0, 8.02 * 4, time_points),
+        isotope_name='Iodine-131',
+        half_life_unit='d',
+        noise_percentage=noise,
+        gamma_emission_probability=0.81,
+        graph=graph,
+        seed=0
+    )
+
+
+def simulation_benchmarks():
+    def setup(method, time_points, noise):
+        def build():
+            sim = make_simulation(time_points, noise)
+            return getattr(sim, method)
+        return build
+
+    return [
+        Benchmark(f"{method}[time_points={n},noise={noise}]", setup(method, n, noise), iterations=200, group='simulation')
+        for method in ('calculate_decay', 'calc_series')
+        for n in TIME_POINTS
+        for noise in NOISE_LEVELS
+    ]
+
+
+def plot_benchmarks():
+    from app.utils.plot_renderer import borrow_template, figure_to_png
+
+    def setup(time_points, graph):
+        def build():
+            sim = make_simulation(time_points, noise=5, graph=GRAPHS[graph])
+            series = sim.calc_series()
+
+            def render():
+                with borrow_template() as template:
+                    return figure_to_png(sim.plot_decay(series, template))
+            return render
+        return build
+
+    return [
+        Benchmark(f"plot_decay_png[time_points={n},graph={graph}]", setup(n, graph), iterations=20, group='rendering')
+        for n in PLOT_TIME_POINTS
+        for graph in GRAPHS
+    ]
+
+
+def loading_benchmarks():
+    from app.utils.isotope_loader import load_unstable_isotopes
+    from app.utils.isotope_registry import IsotopeRegistry
+    from app.utils.isotope_snapshot import build_snapshot
+
+    snapshot_dir = None
+
+    def snapshot_setup():
+        nonlocal snapshot_dir
+        snapshot_dir = tempfile.TemporaryDirectory(ignore_cleanup_errors=True)
+        snapshot_path = Path(snapshot_dir.name) / 'isotopes.npy'
+        build_snapshot(snapshot_path=snapshot_path)
+        return lambda: IsotopeRegistry.from_snapshot(snapshot_path)
+
+    return [
+        Benchmark('load_unstable_isotopes', lambda: load_unstable_isotopes, iterations=50, group='loading'),
+        Benchmark('registry_from_json', lambda: IsotopeRegistry.from_json, iterations=50, group='loading'),
+        Benchmark('registry_from_snapshot', snapshot_setup, iterations=50, group='loading',
+                  teardown=lambda: snapshot_dir.cleanup())
+    ]
+
+
+def http_benchmarks():
+    from app import create_app
+
+    def setup(time_points, noise, graph, render):
+        def build():
+            client = create_app().test_client()
+            body = {
+                'isotope': 'i-131',
+                'initial_amount': 1000,
+                'time_points': time_points,
+                'noise': noise,
+                'checkedBoxes': GRAPHS[graph],
+                'render': render
+            }
+
+            def request():
+                response = client.post('/simulate', json=body)
+                assert response.status_code == 200, response.json
+            return request
+        return build
+
+    # unseeded noisy requests always miss the plot cache; without noise the I-131 plot is
+    # deterministic (its gamma probability is 100%), so after the warmup those hit the cache
+    return [
+        Benchmark(f"http_simulate[time_points={n},noise={noise},graph={graph},render={render}]",
+                  setup(n, noise, graph, render), iterations=20, group='http')
+        for n in HTTP_TIME_POINTS
+        for noise in NOISE_LEVELS
+        for graph in GRAPHS
+        for render in ('server', 'client')
+    ]
+
+
+def all_benchmarks():
+    return simulation_benchmarks() + plot_benchmarks() + loading_benchmarks() + http_benchmarks()
@@ -0,0 +1,130 @@
+"""Times benchmark cases, records peak memory, and compares result files against a baseline."""
+
+import gc
+import json
+import time
+import platform
+import tracemalloc
+import numpy as np
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+COMPARED_METRICS = ('p50_ms', 'p90_ms', 'peak_memory_kib')
+
+@dataclass
+class Benchmark:
+    name: str
+    setup: callable                         # builds inputs once and returns the zero-argument function to time
+    iterations: int = 50
+    group: str = 'misc'
+    teardown: callable = None               # releases whatever setup created, e.g. temporary files
+
+
+def measure(func, iterations, warmup=1):
+    """
+    Time `iterations` calls of `func` after `warmup` untimed calls, then run it once more under
+    tracemalloc so tracing overhead does not leak into the timings.
+
+    Returns:
+        (dict) throughput (calls/s), latency mean and percentiles in ms, and peak traced memory in KiB
+    """
+    for _ in range(warmup):
+        func()
+
+    latencies = np.empty(iterations)
+    gc.collect()
+    for i in range(iterations):
+        start = time.perf_counter()
+        func()
+        latencies[i] = time.perf_counter() - start
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    p50, p90, p99 = np.percentile(latencies, (50, 90, 99)) * 1e3
+    return {
+        'iterations': iterations,
+        'throughput': iterations / latencies.sum(),
+        'mean_ms': latencies.mean() * 1e3,
+        'p50_ms': p50,
+        'p90_ms': p90,
+        'p99_ms': p99,
+        'peak_memory_kib': peak / 1024
+    }
+
+
+def run_benchmarks(benchmarks, quick=False, pattern=None, progress=print):
+    """
+    Run every benchmark whose name contains `pattern`. Quick runs use a fifth of the iterations.
+
+    Returns:
+        (dict) 'meta' describing the environment and 'results' keyed by benchmark name
+    """
+    results = {}
+    for bench in benchmarks:
+        if pattern and pattern not in bench.name:
+            continue
+        iterations = max(3, bench.iterations // 5) if quick else bench.iterations
+        func = bench.setup()
+        try:
+            results[bench.name] = {'group': bench.group, **measure(func, iterations)}
+        finally:
+            if bench.teardown:
+                bench.teardown()
+        if progress:
+            stats = results[bench.name]
+            progress(f"{bench.name:<70} p50 {stats['p50_ms']:9.3f} ms  p99 {stats['p99_ms']:9.3f} ms  "
+                     f"{stats['throughput']:10.1f}/s  peak {stats['peak_memory_kib']:10.1f} KiB")
+
+    return {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.platform(),
+            'quick': quick
+        },
+        'results': results
+    }
+
+
+def compare_results(baseline, current, threshold=0.2, metrics=COMPARED_METRICS):
+    """
+    Compare two result files benchmark by benchmark. A metric regresses when it grew by more than
+    `threshold` (0.2 = 20%) over the baseline.
+
+    Returns:
+        (list) one dict per compared metric with the baseline and current values, relative change
+        and a 'regression' flag; benchmarks missing from either file are skipped
+    """
+    rows = []
+    for name, current_stats in current['results'].items():
+        baseline_stats = baseline['results'].get(name)
+        if baseline_stats is None:
+            continue
+
+        for metric in metrics:
+            before, after = baseline_stats[metric], current_stats[metric]
+            change = (after - before) / before if before else 0.0
+            rows.append({
+                'name': name,
+                'metric': metric,
+                'baseline': before,
+                'current': after,
+                'change': change,
+                'regression': change > threshold
+            })
+    return rows
+
+
+def save_results(results, path):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)
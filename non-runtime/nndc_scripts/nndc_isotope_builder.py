@@ -6,15 +6,26 @@ import os
 import re 
 import json
 import time
+import hashlib
+import argparse
+import threading
 import requests
 import periodictable
 import unicodedata
 
 from bs4 import BeautifulSoup
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from email.utils import parsedate_to_datetime
+from requests.adapters import HTTPAdapter
 
 from target_isotopes import TARGET_ISOTOPES
 
 OUTPUT_FILE = "app/static/models/unstable_isotopes.json"
+NUDAT_URL = "https://www.nndc.bnl.gov/nudat3/decaysearchdirect.jsp"
+CACHE_DIR = "non-runtime/nndc_scripts/html_cache"
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.5                 # seconds before the first retry, doubled for each one after
 
 DECAY_TRANSLATIONS = {
     "β -": "beta minus",
@@ -35,29 +46,214 @@ GREEK_TRANSLATIONS = {
     "ε": "epsilon"
 }
 
-if not os.path.exists(OUTPUT_FILE):
-    with open(OUTPUT_FILE, "w") as f:
-        json.dump({}, f)
-        
-try:
-    with open(OUTPUT_FILE, "r") as f:
-        ISOTOPES_DATA = json.load(f)
-except (FileNotFoundError, json.JSONDecodeError):
-    ISOTOPES_DATA = {}
-
-def get_response(url):
+def load_dataset(output_file=OUTPUT_FILE):
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        return response
-    except requests.RequestException as e:
-        print(f"Error at {url}: {e}")
+        with open(output_file, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def journal_path(output_file):
+    return f"{output_file}.journal"
+
+
+def append_record(journal, record):
+    """
+    Append one isotope record as a JSON line. Each write costs O(1) no matter how large the dataset is.
+    """
+    journal.write(json.dumps(record) + "\n")
+    journal.flush()
+
+
+def read_journal(path):
+    """
+    Yield the records of a journal, skipping a final line left incomplete by a crash mid-write.
+    """
+    try:
+        with open(path, "r") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+    except FileNotFoundError:
+        return
+
+
+def compact_dataset(output_file=OUTPUT_FILE):
+    """
+    Fold the journal into the dataset file. The merged dataset is written to a temporary file and
+    swapped in with os.replace, so readers see either the old or the new file and never a partial
+    one; the journal is only removed once the swap has happened.
+
+    Returns:
+        (dict) the compacted dataset keyed by short name
+    """
+    isotopes_data = load_dataset(output_file)
+    journal = journal_path(output_file)
+    for record in read_journal(journal):
+        isotopes_data[record["short_name"]] = record
+
+    write_dataset(output_file, isotopes_data)
+
+    if os.path.exists(journal):
+        os.remove(journal)
+    return isotopes_data
+
+
+def write_dataset(output_file, isotopes_data):
+    tmp_file = f"{output_file}.tmp"
+    with open(tmp_file, "w") as f:
+        json.dump(isotopes_data, f, indent=4)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, output_file)
+
+
+class HtmlCache:
+    """
+    Content-addressed store of raw NuDat pages. Each page is saved once under the SHA-256 of its
+    content in `objects/`, and `refs/<nuclide>` holds the digest of that nuclide's latest page, so
+    identical pages share one file and every write is a single small atomic file.
+    """
+
+    def __init__(self, root=CACHE_DIR):
+        self.root = root
+        os.makedirs(os.path.join(root, "objects"), exist_ok=True)
+        os.makedirs(os.path.join(root, "refs"), exist_ok=True)
+
+    def object_path(self, digest):
+        return os.path.join(self.root, "objects", digest[:2], f"{digest}.html")
+
+    def ref_path(self, nuclide):
+        return os.path.join(self.root, "refs", nuclide)
+
+    def put(self, nuclide, html):
+        digest = hashlib.sha256(html.encode()).hexdigest()
+        path = self.object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            write_atomic(path, html)
+        write_atomic(self.ref_path(nuclide), digest)
+        return digest
+
+    def path(self, nuclide):
+        try:
+            with open(self.ref_path(nuclide), "r") as f:
+                return self.object_path(f.read().strip())
+        except FileNotFoundError:
+            return None
+
+    def get(self, nuclide):
+        path = self.path(nuclide)
+        if path is None or not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def nuclides(self):
+        return sorted(os.listdir(os.path.join(self.root, "refs")))
+
+
+def write_atomic(path, text):
+    # unique per thread, as several workers may cache the same page at once
+    tmp_file = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_file, path)
+
+
+class TokenBucket:
+    """
+    Rate limiter shared by all worker threads: allows `rate` requests per second on average, with
+    bursts of up to `capacity` requests.
+    """
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def make_session(pool_size):
+    """
+    One keep-alive connection pool for every worker. Retries are left to `get_response`, so they
+    go through the rate limiter like any other request.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def retry_after(response):
+    """
+    Returns:
+        (float) seconds the server asked us to wait through a Retry-After header, or None
+    """
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0)
+    except (TypeError, ValueError):
         return None
 
 
-def get_table(response=None, element=None, iso_num=None):
-    soup = BeautifulSoup(response.text, "html.parser")
-    
+def get_response(url, session=requests, bucket=None, retries=MAX_RETRIES):
+    """
+    GET a page, retrying throttled (429), server error and connection failures with exponential
+    backoff. Every attempt takes a token from `bucket`, and a Retry-After header is honored when it
+    asks for a longer wait than the backoff.
+
+    Returns:
+        (requests.Response) the successful response, or None once the retries are used up
+    """
+    for attempt in range(retries + 1):
+        if bucket:
+            bucket.acquire()
+
+        response = None
+        try:
+            response = session.get(url, timeout=10)
+            if response.status_code not in RETRY_STATUSES:
+                response.raise_for_status()
+                return response
+            error = f"HTTP {response.status_code}"
+        except requests.HTTPError as e:
+            print(f"Error at {url}: {e}")
+            return None
+        except requests.RequestException as e:
+            error = e
+
+        if attempt == retries:
+            print(f"Error at {url}: {error}, giving up after {retries} retries")
+            return None
+        delay = RETRY_BACKOFF * 2 ** attempt
+        time.sleep(max(delay, retry_after(response) or 0))
+
+
+def get_table(soup):
     tables = soup.find_all("table")
 
     for idx, table in enumerate(tables):
@@ -80,7 +276,8 @@ def extract_half_life(raw_value):
     if not raw_value:
         return "unknown", "unknown", "unknown"
 
-    raw_value = raw_value.replace("\u00d7", "e").replace("×", "e")
+    # "4.468×10 +9 y" → "4.468e+9 y"; replacing only the × would leave "4.468e10 +9 y"
+    raw_value = re.sub(r"\s*\u00d7\s*10\s*\^?\s*([+-]?\d+)", r"e\1", raw_value)
     raw_value = re.sub(r"\s*±\s*", " ", raw_value)
 
     parts = raw_value.strip().split()
@@ -189,7 +386,6 @@ def extract_from_rows(table=None, element=None, iso_num=None):
         half_life_value, half_life_unit, half_life_uncertainty = extract_half_life(row_data.get("Parent Half-Life", ""))
         decay_mode_dict = extract_decay_mode(row_data.get("Decay Mode", ""))
 
-        print(dir(element))
         structured_entry = {
             "name": f"{element.name}-{iso_num}",
             "short_name": f"{element.symbol}-{iso_num}",
@@ -212,54 +408,229 @@ def extract_from_rows(table=None, element=None, iso_num=None):
     return extracted_data[0] if len(extracted_data) == 1 else None
 
 
-def check_stability(response):
-    soup = BeautifulSoup(response.text, "html.parser")
+def check_stability(soup):
     if "No datasets were found since nucleus is stable" in soup.get_text():
         return 'stable'
 
 
-def parse_response(response=None, element=None, iso_num=None):
-    if check_stability(response) == 'stable':
+def parse_page(html, element=None, iso_num=None):
+    """
+    Parse a NuDat decay page with a single BeautifulSoup pass shared by every extraction step.
+
+    Returns:
+        (dict) the isotope record, False for a stable nucleus, or None if no single decay row was found
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    if check_stability(soup) == 'stable':
         return False
     
-    table = get_table(response=response, element=element, iso_num=iso_num)
+    table = get_table(soup)
     element_data = extract_from_rows(table=table, element=element, iso_num=iso_num)
     return element_data
 
 
-def get_half_life_data(element, isotope_number):
-    url = f"https://www.nndc.bnl.gov/nudat3/decaysearchdirect.jsp?nuc={element.symbol}{isotope_number}&unc=NDS"
-    response = get_response(url)
+def get_half_life_data(element, isotope_number, session=requests, base_url=NUDAT_URL, cache=None, bucket=None):
+    """
+    Fetch and parse one nuclide's NuDat decay page. With a cache, a page fetched before is read from
+    disk instead, and newly fetched pages are stored; only network requests wait on the rate limiter.
 
-    element_data = parse_response(response=response, element=element, iso_num=isotope_number)
+    Returns:
+        (str) 'ok', 'stable', 'unparsed' (no single decay row could be read) or 'failed' (request error)
+        (dict) the isotope record when the status is 'ok', otherwise None
+    """
+    nuclide = nuclide_name(element, isotope_number)
+    html = cache.get(nuclide) if cache else None
+
+    if html is None:
+        url = f"{base_url}?nuc={element.symbol}{isotope_number}&unc=NDS"
+        response = get_response(url, session, bucket)
+        if response is None:
+            return 'failed', None
+        html = response.text
+        if cache:
+            cache.put(nuclide, html)
+
+    element_data = parse_page(html, element=element, iso_num=isotope_number)
     
     if element_data is False:
         print(f"{element}-{isotope_number} is stable. Continuing...")
-        return None 
+        return 'stable', None 
+    if element_data is None:
+        return 'unparsed', None
     
-    return element_data
+    return 'ok', element_data
+
+
+def load_cursor(cursor_file, work):
+    """
+    Read the resume cursor: every nuclide before `position` in the work list is finished. The cursor
+    also names the nuclide it stopped at, so a cursor written for a different target list is ignored.
+
+    Returns:
+        (int) index into `work` to resume from
+    """
+    try:
+        with open(cursor_file, "r") as f:
+            cursor = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return 0
+
+    position = cursor.get("position", 0)
+    if position == len(work) and cursor.get("next") is None:
+        return position
+    if 0 <= position < len(work) and cursor.get("next") == nuclide_name(*work[position]):
+        return position
+    return 0
+
+
+def save_cursor(cursor_file, work, position):
+    next_nuclide = nuclide_name(*work[position]) if position < len(work) else None
+    tmp_file = f"{cursor_file}.tmp"
+    with open(tmp_file, "w") as f:
+        json.dump({"position": position, "next": next_nuclide}, f)
+    os.replace(tmp_file, cursor_file)
+
+
+def nuclide_name(element, isotope_number):
+    return f"{element.symbol}-{isotope_number}"
 
 
-def scrape_isotopes():
-    for element in periodictable.elements:
+def scrape_isotopes(targets=TARGET_ISOTOPES, output_file=OUTPUT_FILE, cursor_file=None, base_url=NUDAT_URL,
+                    workers=8, rate=4.0, resume=True, cache=None):
+    """
+    Scrape every target nuclide concurrently. Workers share one pooled session and one token bucket,
+    so `rate` caps the requests per second sent to NNDC however many workers run. Results are
+    written from the calling thread as they complete.
+
+    Each scraped isotope is appended to a JSONL journal next to the output file, and the journal is
+    compacted into the output file once at the end (see `compact_dataset`). Progress is kept in a
+    resume cursor next to the output file. Nuclides whose request failed do
+    not advance it, so an interrupted or partially failed run picks up where it stopped; nuclides
+    already in the output file are not fetched again. Without `resume`, every target is processed
+    again and existing entries are refreshed, with pages still read from `cache` when it has them.
+
+    Args:
+        targets (set): short names (e.g. "U-238") to scrape, or None for every isotope in periodictable
+        output_file (str): dataset path, rewritten once when the run finishes
+        cursor_file (str, optional): resume cursor path, defaults to the output path plus ".cursor"
+        base_url (str): NuDat decay search endpoint
+        workers (int): concurrent requests
+        rate (float): requests per second across all workers
+        resume (bool): continue from the saved cursor and skip nuclides already in the output,
+            instead of starting over
+        cache (HtmlCache, optional): raw page cache to read from and fill
+
+    Returns:
+        (dict) the dataset keyed by short name
+    """
+    cursor_file = cursor_file or f"{output_file}.cursor"
+    isotopes_data = load_dataset(output_file)
+    for record in read_journal(journal_path(output_file)):
+        isotopes_data[record["short_name"]] = record
+
+    work = [
+        (element, isotope_number)
+        for element in periodictable.elements
+        for isotope_number in element.isotopes
+        if targets is None or nuclide_name(element, isotope_number) in targets
+    ]
+    position = load_cursor(cursor_file, work) if resume else 0
+    finished = [i < position or (resume and nuclide_name(*work[i]) in isotopes_data) for i in range(len(work))]
+
+    session = make_session(workers)
+    bucket = TokenBucket(rate, capacity=workers)
+
+    def fetch(element, isotope_number):
+        print(f"Checking isotope: {nuclide_name(element, isotope_number)}")
+        return get_half_life_data(element, isotope_number, session, base_url, cache, bucket)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool, open(journal_path(output_file), "a") as journal:
+        futures = {pool.submit(fetch, *work[i]): i for i in range(len(work)) if not finished[i]}
+
+        for future in as_completed(futures):
+            i = futures[future]
+            status, isotope_data = future.result()
+
+            if status == 'ok':
+                isotopes_data[isotope_data["short_name"]] = isotope_data
+                append_record(journal, isotope_data)
+                print(f"Saved {isotope_data['short_name']}: {isotope_data['half_life']} {isotope_data['half_life_unit']}")
+
+            if status != 'failed':
+                finished[i] = True
+
+            start = position
+            while position < len(work) and finished[position]:
+                position += 1
+            if position != start:
+                save_cursor(cursor_file, work, position)
+
+    if position == len(work):
+        save_cursor(cursor_file, work, position)
+    return compact_dataset(output_file)
+
+
+def parse_cached_page(nuclide, path):
+    symbol, isotope_number = nuclide.rsplit("-", 1)
+    element = periodictable.elements.symbol(symbol)
+    with open(path, "r", encoding="utf-8") as f:
+        html = f.read()
+    return parse_page(html, element=element, iso_num=int(isotope_number))
+
+
+def reparse_cache(cache_dir=CACHE_DIR, output_file=OUTPUT_FILE, workers=None):
+    """
+    Rebuild the dataset from cached pages only, parsing them across a process pool. Makes no network
+    requests, so parser changes can be checked against exactly the same pages every time.
+
+    Returns:
+        (dict) the rebuilt dataset keyed by short name, in periodic table order
+    """
+    cache = HtmlCache(cache_dir)
+    pages = [(nuclide, cache.path(nuclide)) for nuclide in cache.nuclides()]
+    # a ref whose page was never written (e.g. an interrupted put) has nothing to parse
+    pages = [(nuclide, path) for nuclide, path in pages if path is not None and os.path.exists(path)]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        records = pool.map(parse_cached_page, *zip(*pages), chunksize=16) if pages else []
+        records = [record for record in records if record]
 
-        for isotope_number in element.isotopes:
-            print(f"Checking isotope: {element.symbol}-{isotope_number}")
-            short_name = f"{element.symbol}-{isotope_number}"
-            if short_name in TARGET_ISOTOPES:
-                isotope_data = get_half_life_data(element, isotope_number)
-                print(isotope_data)
-                if isotope_data:
-                    ISOTOPES_DATA[isotope_data["short_name"]] = isotope_data
-                    print(f"Saved {isotope_data['short_name']}: {isotope_data['half_life']} {isotope_data['half_life_unit']}")
-                    
-                    with open(OUTPUT_FILE, "w") as f:
-                        json.dump(ISOTOPES_DATA, f, indent=4)
-                    
-                    time.sleep(1)
+    records.sort(key=lambda record: (record["atomic_number"], int(record["short_name"].rsplit("-", 1)[1])))
+    isotopes_data = {record["short_name"]: record for record in records}
+    write_dataset(output_file, isotopes_data)
+    return isotopes_data
 
 
 if __name__ == "__main__":
-    scrape_isotopes()
+    parser = argparse.ArgumentParser(description="Scrape NNDC decay data into unstable_isotopes.json.")
+    parser.add_argument("--all", action="store_true", help="scrape every known isotope instead of TARGET_ISOTOPES")
+    parser.add_argument("--output", default=OUTPUT_FILE)
+    parser.add_argument("--base-url", default=NUDAT_URL)
+    parser.add_argument("--workers", type=int, default=8, help="concurrent requests")
+    parser.add_argument("--rate", type=float, default=4.0, help="requests per second across all workers")
+    parser.add_argument("--restart", action="store_true", help="ignore the saved resume cursor and redo isotopes already in the output; "
+                             "pages still come from the cache unless --no-cache is also given")
+    parser.add_argument("--compact", action="store_true", help="only fold the journal of an interrupted run into the output")
+    parser.add_argument("--cache-dir", default=CACHE_DIR, help="raw page cache")
+    parser.add_argument("--no-cache", action="store_true", help="always fetch pages and do not store them")
+    parser.add_argument("--reparse", action="store_true", help="rebuild the output from cached pages without network access")
+    args = parser.parse_args()
+
+    if args.compact:
+        compact_dataset(args.output)
+        raise SystemExit
+    if args.reparse:
+        reparse_cache(args.cache_dir, args.output)
+        raise SystemExit
+
+    scrape_isotopes(
+        targets=None if args.all else TARGET_ISOTOPES,
+        output_file=args.output,
+        base_url=args.base_url,
+        workers=args.workers,
+        rate=args.rate,
+        resume=not args.restart,
+        cache=None if args.no_cache else HtmlCache(args.cache_dir)
+    )
 
     # print(unicodedata.normalize("NFKC", "𝛽"))
\ No newline at end of file
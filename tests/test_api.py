@@ -0,0 +1,379 @@
+"""Tests for the simulation API routes using the Flask test client."""
+
+import pytest
+import numpy as np
+import base64
+import sys
+import os
+import json
+import time
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from app.routes.api import PLOT_CACHE, build_simulation
+from app.utils.job_queue import JobQueue
+from app.utils.metrics import Histogram, REQUEST_SECONDS, STAGE_SECONDS
+from app.utils.plot_cache import PlotCache
+from app.utils.plot_renderer import TemplatePool, figure_to_png, render_in_pool
+
+
+@pytest.fixture
+def client():
+    return create_app().test_client()
+
+
+def simulation_request(**overrides):
+    body = {
+        'isotope': 'c-14',
+        'initial_amount': 1000,
+        'time_points': 20,
+        'noise': 0,
+        'checkedBoxes': ['remaining', 'decayed', 'gamma', 'hl']
+    }
+    body.update(overrides)
+    return body
+
+
+def test_simulate_returns_plot_and_data(client):
+    response = client.post('/simulate', json=simulation_request())
+    assert response.status_code == 200
+    assert response.json['plot']
+    assert len(response.json['data']) == 20
+
+
+def test_simulate_data_only(client):
+    response = client.post('/simulate', json=simulation_request(include_plot=False))
+    assert response.status_code == 200
+    assert 'plot' not in response.json
+    assert len(response.json['data']) == 20
+
+
+def test_simulate_plot_returns_png(client):
+    response = client.post('/simulate/plot', json=simulation_request())
+    assert response.status_code == 200
+    assert response.mimetype == 'image/png'
+    assert response.data.startswith(b'\x89PNG')
+
+
+def test_simulate_rejects_unknown_isotope(client):
+    response = client.post('/simulate/plot', json=simulation_request(isotope='xx-1'))
+    assert response.status_code == 400
+    assert 'error' in response.json
+
+
+def test_simulate_batch(client):
+    response = client.post('/simulate/batch', json={
+        'isotopes': ['c-14', 'i-131'],
+        'initial_amounts': [100, 1000],
+        'noise': 0,
+        'time_points': 10
+    })
+    assert response.status_code == 200
+    assert len(response.json['scenarios']) == 4
+    assert len(response.json['remaining']) == 4
+    assert len(response.json['remaining'][0]) == 10
+
+
+def test_plot_cache_hits_for_seeded_noisy_runs(client):
+    PLOT_CACHE.clear()
+    body = simulation_request(noise=5, seed=42)
+
+    first = client.post('/simulate', json=body).json
+    hits = PLOT_CACHE.hits
+    second = client.post('/simulate', json=body).json
+
+    assert PLOT_CACHE.hits == hits + 1
+    assert first == second
+
+
+def test_plot_cache_ignores_seed_for_deterministic_plots(client):
+    PLOT_CACHE.clear()
+    client.post('/simulate/plot', json=simulation_request(seed=1))
+    hits = PLOT_CACHE.hits
+    client.post('/simulate/plot', json=simulation_request(seed=2))
+    client.post('/simulate/plot', json=simulation_request())
+
+    assert PLOT_CACHE.stats()['entries'] == 1
+    assert PLOT_CACHE.hits == hits + 2
+
+
+def test_plot_cache_skips_unseeded_noisy_runs(client):
+    PLOT_CACHE.clear()
+    client.post('/simulate/plot', json=simulation_request(noise=5))
+    assert PLOT_CACHE.stats()['entries'] == 0
+
+
+def test_plot_cache_evicts_least_recently_used():
+    cache = PlotCache(max_bytes=10)
+    cache.put('a', b'1234')
+    cache.put('b', b'1234')
+    cache.get('a')
+    cache.put('c', b'1234')
+
+    assert cache.get('b') is None
+    assert cache.get('a') == b'1234'
+    assert cache.size_bytes <= 10
+
+
+def test_render_in_pool_matches_inline_render():
+    sim, _ = build_simulation(simulation_request())
+    series = sim.calc_series()
+
+    pooled = render_in_pool(sim, series, workers=1)
+    assert pooled.startswith(b'\x89PNG')
+    assert pooled == figure_to_png(sim.plot_decay(series))
+
+
+def test_template_pool_reuses_templates_across_threads():
+    pool = TemplatePool(max_idle=2)
+    sim, _ = build_simulation(simulation_request())
+    series = sim.calc_series()
+    borrowed = []
+
+    def render():
+        with pool.borrow() as template:
+            borrowed.append((template, figure_to_png(sim.plot_decay(series, template))))
+
+    for _ in range(3):
+        thread = threading.Thread(target=render)
+        thread.start()
+        thread.join()
+
+    assert len({id(template) for template, _ in borrowed}) == 1
+    assert {png for _, png in borrowed} == {figure_to_png(sim.plot_decay(series))}
+
+    with pool.borrow() as first, pool.borrow() as second:
+        assert first is not second
+
+
+def test_simulate_columnar_base64(client):
+    body = simulation_request(include_plot=False, format='columnar', encoding='base64', dtype='float32')
+    data = client.post('/simulate', json=body).json['data']
+    rows = client.post('/simulate', json=simulation_request(include_plot=False)).json['data']
+
+    remaining = np.frombuffer(base64.b64decode(data['columns']['remaining']), dtype='<f4')
+    assert data['shape'] == [20]
+    assert np.allclose(remaining, [float(row['remaining']) for row in rows], atol=0.01)
+
+
+def test_simulate_rejects_unknown_format(client):
+    response = client.post('/simulate', json=simulation_request(format='columnar', dtype='int8'))
+    assert response.status_code == 400
+
+
+def test_simulate_export_streams_every_point(client):
+    body = simulation_request(time_points=25, chunk_size=10)
+    lines = client.post('/simulate/export', json=body).data.decode().splitlines()
+    assert len(lines) == 25
+    assert json.loads(lines[0])['remaining'] == 1000
+
+    csv_lines = client.post('/simulate/export', json=dict(body, format='csv')).data.decode().splitlines()
+    assert csv_lines[0] == 'time,remaining,decayed,rate,gamma'
+    assert len(csv_lines) == 26
+
+
+def test_chain_endpoint(client):
+    response = client.post('/chain', json={'isotope': 'Ra-226', 'initial_amount': 1000, 'time_points': 50})
+    assert response.status_code == 200
+    assert response.json['members'][0] == 'Ra-226'
+    assert response.json['series']['shape'] == [len(response.json['members']), 50]
+
+
+def test_chain_log_grid_reaches_max_time(client):
+    params = {'isotope': 'Ra-226', 'initial_amount': 1000, 'grid': 'log', 'max_time': 100}
+    response = client.post('/chain', json={**params, 'time_points': 3})
+    assert response.json['time']['columns']['time'][-1] == pytest.approx(100)
+
+    assert client.post('/chain', json={**params, 'time_points': 2}).status_code == 400
+
+
+def test_chain_rejects_non_string_isotope(client):
+    params = {'isotope': ['Ra-226'], 'initial_amount': 1000, 'time_points': 50}
+    assert client.post('/chain', json=params).status_code == 400
+
+    submitted = client.post('/jobs', json={'kind': 'chain', 'params': params})
+    assert wait_for_job(client, submitted.json['id']) == 'done'
+    assert client.get(submitted.json['result_url']).status_code == 400
+
+
+def test_simulate_ensemble(client):
+    response = client.post('/simulate/ensemble', json={
+        'isotope': 'i-131', 'initial_amount': 1000, 'time_points': 50, 'runs': 200, 'seed': 1
+    })
+    assert response.status_code == 200
+    columns = response.json['data']['columns']
+    assert {'mean', 'variance', 'p5', 'p50', 'p95'} <= set(columns)
+    assert columns['p5'][-1] <= columns['p95'][-1]
+
+
+def test_simulate_ensemble_edge_inputs(client):
+    params = {'isotope': 'i-131', 'time_points': 20, 'runs': 10, 'seed': 1}
+
+    # counts beyond int64 fall back to Poisson sampling instead of overflowing
+    response = client.post('/simulate/ensemble', json={**params, 'initial_amount': 1e20})
+    assert response.status_code == 200
+    assert response.json['data']['columns']['mean'][0] == pytest.approx(1e20, rel=1e-6)
+
+    # fractional amounts are rounded to whole atoms, and the expected curve starts from the same count
+    columns = client.post('/simulate/ensemble', json={**params, 'initial_amount': 99.6}).json['data']['columns']
+    assert columns['expected'][0] == 100
+    assert max(columns['p95']) <= 100
+
+    response = client.post('/simulate/ensemble', json={**params, 'initial_amount': 100, 'percentiles': '50'})
+    assert response.status_code == 400
+
+
+def test_plot_cache_skips_unseeded_gamma_plots(client):
+    PLOT_CACHE.clear()
+    client.post('/simulate/plot', json=simulation_request(isotope='bi-214', checkedBoxes=['gamma']))
+    assert PLOT_CACHE.stats()['entries'] == 0
+
+
+def wait_for_job(client, job_id, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        status = client.get(f'/jobs/{job_id}').json['status']
+        if status in ('done', 'failed'):
+            return status
+        time.sleep(0.05)
+    raise TimeoutError(job_id)
+
+
+def test_job_runs_in_background(client):
+    params = {'isotope': 'i-131', 'initial_amount': 1000, 'time_points': 50, 'runs': 200, 'seed': 1}
+    submitted = client.post('/jobs', json={'kind': 'ensemble', 'params': params})
+    assert submitted.status_code == 202
+
+    assert wait_for_job(client, submitted.json['id']) == 'done'
+    result = client.get(submitted.json['result_url'])
+    assert result.status_code == 200
+    assert result.json == client.post('/simulate/ensemble', json=params).json
+
+
+def test_job_result_replays_validation_errors(client):
+    submitted = client.post('/jobs', json={'kind': 'chain', 'params': {'isotope': 'nope'}})
+    wait_for_job(client, submitted.json['id'])
+    assert client.get(submitted.json['result_url']).status_code == 400
+
+    assert client.post('/jobs', json={'kind': 'unknown', 'params': {}}).status_code == 400
+    assert client.get('/jobs/missing').status_code == 404
+
+
+def test_simulate_job_skips_request_metrics(client):
+    STAGE_SECONDS.clear()
+    params = simulation_request(seed=3, noise=5, render='client')
+    submitted = client.post('/jobs', json={'kind': 'simulate', 'params': params})
+
+    assert wait_for_job(client, submitted.json['id']) == 'done'
+    assert STAGE_SECONDS.expose()[2:] == []
+    assert client.get(submitted.json['result_url']).json == client.post('/simulate', json=params).json
+
+
+def test_job_queue_expires_finished_results():
+    queue = JobQueue(workers=1, max_jobs=2, ttl=0)
+    job = queue.submit('test', lambda: 42)
+    while job.finished_at is None:
+        time.sleep(0.01)
+    time.sleep(0.01)
+    assert queue.get(job.id) is None
+
+
+def parse_events(body):
+    events = []
+    for block in body.decode().strip().split('\n\n'):
+        event, data = block.split('\n')
+        events.append((event[len('event: '):], json.loads(data[len('data: '):])))
+    return events
+
+
+def test_simulate_stream_matches_simulate(client):
+    body = simulation_request(noise=5, seed=3, time_points=50)
+    query = {**body, 'chunk_size': 16, 'runs': 40}
+    events = parse_events(client.get('/simulate/stream', query_string=query).data)
+
+    names = [name for name, _ in events]
+    assert names[0] == 'meta' and names[-1] == 'done'
+    assert names.count('rows') == 4
+
+    rows = [row for name, payload in events if name == 'rows' for row in payload]
+    assert rows == client.post('/simulate', json=dict(body, include_plot=False)).json['data']
+
+    ensemble = [payload for name, payload in events if name == 'ensemble']
+    assert ensemble[-1]['runs'] == 40
+    assert ensemble[-1]['data']['shape'] == [50]
+    assert len(ensemble) == 10
+
+    # the table the stream fills is interactive, so it shares /simulate's point limit
+    too_many = {**query, 'time_points': 1001}
+    assert client.get('/simulate/stream', query_string=too_many).status_code == 400
+
+
+def test_simulate_client_render_returns_plot_spec(client):
+    response = client.post('/simulate', json=simulation_request(render='client', checkedBoxes=['remaining', 'hl']))
+    assert response.status_code == 200
+    assert 'plot' not in response.json
+
+    spec = response.json['plot_spec']
+    assert [series['visible'] for series in spec['series']] == [True, False, False]
+    assert spec['half_life'] == {'x': 5700.0, 'label': 'First Half-Life', 'color': 'rgb(255, 255, 255)',
+                                 'linestyle': '--', 'visible': True}
+    assert spec['series'][0]['color'] == 'rgb(0, 184, 217)'
+
+
+def test_query_endpoint(client):
+    response = client.post('/query', json={'isotope': 'c-14', 'initial_amount': 1000, 'query': 'remaining',
+                                           'time': [0, 5700, 11400]})
+    assert response.status_code == 200
+    assert response.json['data']['columns']['remaining'] == pytest.approx([1000, 500, 250])
+
+    response = client.post('/query', json={'isotope': 'c-14', 'initial_amount': 1000, 'query': 'time_to_activity',
+                                           'activity': 1000 * np.log(2) / 5700 / 4})
+    assert response.json['data']['columns']['time_to_activity'] == pytest.approx([11400])
+
+    assert client.post('/query', json={'isotope': 'c-14', 'initial_amount': 1000, 'query': 'remaining',
+                                       'time': [-1]}).status_code == 400
+    for query in (['remaining'], {'remaining': 1}):
+        assert client.post('/query', json={'isotope': 'c-14', 'initial_amount': 1000, 'query': query,
+                                           'time': [0]}).status_code == 400
+
+
+def test_simulate_adaptive_grid(client):
+    response = client.post('/simulate', json=simulation_request(grid='adaptive', time_points=1000, include_plot=False))
+    assert response.status_code == 200
+    assert 10 < len(response.json['data']) < 1000
+
+    assert client.post('/simulate', json=simulation_request(grid='cubic')).status_code == 400
+    assert client.post('/simulate/export', json=simulation_request(grid='log')).status_code == 400
+
+
+def test_simulate_server_timing_and_metrics(client):
+    PLOT_CACHE.clear()
+    STAGE_SECONDS.clear()
+    REQUEST_SECONDS.clear()
+
+    response = client.post('/simulate', json=simulation_request(noise=5))
+    stages = [entry.split(';')[0] for entry in response.headers['Server-Timing'].split(', ')]
+    assert stages == ['parse', 'compute', 'data_points', 'draw', 'savefig', 'base64', 'serialize', 'total']
+
+    client.post('/simulate', json=simulation_request(render='client'))
+    metrics = client.get('/metrics')
+    assert metrics.mimetype == 'text/plain'
+    assert 'simulate_stage_seconds_count{stage="compute"} 2' in metrics.text
+    assert 'simulate_stage_seconds_count{stage="draw"} 1' in metrics.text
+    assert 'simulate_request_seconds_bucket{isotope="carbon-14",le="+Inf"} 2' in metrics.text
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram('latency_seconds', 'Test latency.', labels=('stage',), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(value, 'a"b')
+
+    assert histogram.expose()[2:] == [
+        'latency_seconds_bucket{stage="a\\"b",le="0.1"} 1',
+        'latency_seconds_bucket{stage="a\\"b",le="1"} 3',
+        'latency_seconds_bucket{stage="a\\"b",le="+Inf"} 4',
+        'latency_seconds_sum{stage="a\\"b"} 6.05',
+        'latency_seconds_count{stage="a\\"b"} 4'
+    ]
@@ -0,0 +1,55 @@
+"""Tests for the benchmark runner and regression comparison."""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.__main__ import main
+from benchmarks.runner import Benchmark, compare_results, run_benchmarks, save_results
+
+
+def test_run_benchmarks_reports_latency_and_memory():
+    bench = Benchmark('allocate', lambda: (lambda: bytearray(1 << 20)), iterations=10)
+    results = run_benchmarks([bench, Benchmark('skipped', lambda: None)], pattern='alloc', progress=None)
+
+    stats = results['results']['allocate']
+    assert list(results['results']) == ['allocate']
+    assert stats['iterations'] == 10
+    assert stats['p50_ms'] <= stats['p90_ms'] <= stats['p99_ms']
+    assert stats['peak_memory_kib'] >= 1024
+
+
+def test_compare_flags_regressions(tmp_path):
+    def results(p50, memory):
+        return {'results': {'case': {'p50_ms': p50, 'p90_ms': p50, 'peak_memory_kib': memory}}}
+
+    rows = compare_results(results(10.0, 100.0), results(11.0, 150.0), threshold=0.2)
+    assert {row['metric']: row['regression'] for row in rows} == {
+        'p50_ms': False, 'p90_ms': False, 'peak_memory_kib': True
+    }
+
+    save_results(results(10.0, 100.0), tmp_path / 'baseline.json')
+    save_results(results(10.5, 100.0), tmp_path / 'current.json')
+    save_results(results(20.0, 100.0), tmp_path / 'slower.json')
+    assert main(['compare', str(tmp_path / 'baseline.json'), str(tmp_path / 'current.json')]) == 0
+    assert main(['compare', str(tmp_path / 'baseline.json'), str(tmp_path / 'slower.json')]) == 1
+
+
+def test_run_leaves_the_baseline_alone(tmp_path, monkeypatch):
+    monkeypatch.setattr('benchmarks.__main__.BASELINE_PATH', str(tmp_path / 'baseline.json'))
+    monkeypatch.setattr('benchmarks.__main__.RESULTS_PATH', str(tmp_path / 'results.json'))
+
+    assert main(['run', '--filter', 'no such benchmark']) == 0
+    assert sorted(os.listdir(tmp_path)) == ['results.json']
+
+    assert main(['run', '--filter', 'no such benchmark', '--save-baseline']) == 0
+    assert sorted(os.listdir(tmp_path)) == ['baseline.json', 'results.json']
+
+
+def test_teardown_runs_after_each_benchmark():
+    calls = []
+    bench = Benchmark('case', lambda: (lambda: None), iterations=3, teardown=lambda: calls.append('teardown'))
+    run_benchmarks([bench], progress=None)
+    assert calls == ['teardown']
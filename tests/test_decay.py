@@ -8,7 +8,17 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from app.utils.decay_simulator import DecaySimulation
+from app.utils.batch_simulator import BatchDecaySimulation
+from app.utils.decay_chain import DecayChain
+from app.utils.decay_matrix import DecayMatrixStore
+from app.utils.decay_queries import evaluate_query
+from app.utils.monte_carlo import ENSEMBLE_BLOCK_RUNS, ensemble_statistics
+from app.utils.parallel_monte_carlo import get_pool, merge_moments, run_ensemble_parallel
 from app.utils.isotope_loader import load_unstable_isotopes
+from app.utils.isotope_registry import IsotopeRegistry, get_registry
+from app.utils.isotope_snapshot import build_snapshot
+from app.utils.time_grid import adaptive_grid, build_time_grid
+from app.static.models.isotopes import TIME_UNITS_IN_SECONDS, to_seconds
 
 ISOTOPES = load_unstable_isotopes()
 
@@ -140,5 +150,306 @@ def test_edge_cases():
     assert d[0] == 0
 
 
+def test_calc_series_consistent():
+    sim = DecaySimulation(
+        init_amt=1000,
+        half_life=100,
+        time_pts=np.linspace(0, 400, 50),
+        isotope_name="test",
+        half_life_unit="s",
+        noise_percentage=10,
+        gamma_emission_probability=0.5,
+        graph=""
+    )
+
+    decayed, activity, remaining, gamma = sim.calc_series()
+    assert np.allclose(decayed + remaining, 1000)
+    assert np.allclose(activity, sim.decay_const * remaining)
+    assert np.all(gamma <= np.maximum(decayed, 0))
+
+
+def test_batch_matches_single_simulation():
+    half_lives = np.array([100, 5730])
+    init_amts = np.array([1000, 50])
+    time_pts = BatchDecaySimulation.scaled_time_grid(half_lives, 20)
+
+    batch = BatchDecaySimulation(
+        init_amts=init_amts,
+        half_lives=half_lives,
+        time_pts=time_pts,
+        noise_percentages=0,
+        gamma_emission_probabilities=0
+    )
+    _, batch_activity, batch_remaining, _ = batch.calc_series()
+    assert batch_remaining.shape == (2, 20)
+
+    for i in range(2):
+        sim = DecaySimulation(
+            init_amt=init_amts[i],
+            half_life=half_lives[i],
+            time_pts=time_pts[i],
+            isotope_name="test",
+            half_life_unit="s",
+            noise_percentage=0.0,
+            gamma_emission_probability=0,
+            graph=""
+        )
+        _, activity, remaining, _ = sim.calc_series()
+        assert np.allclose(batch_remaining[i], remaining)
+        assert np.allclose(batch_activity[i], activity)
+
+
+def test_registry_indexes_and_units():
+    registry = get_registry()
+    assert registry is get_registry()
+
+    iodine = registry.get("I-131")
+    assert iodine == ISOTOPES["i-131"]
+    assert np.isclose(iodine.half_life_seconds, iodine.half_life * 86400)
+    assert np.isclose(iodine.decay_const, np.log(2) / iodine.half_life_seconds)
+    assert iodine.daughter == "Xe-131"
+
+    assert "U-238" in [iso.short_name for iso in registry.by_atomic_number[92]]
+    assert all(iso.decay_mode == "alpha" for iso in registry.by_decay_mode["alpha"])
+    assert registry.decay_consts.shape == (len(registry),)
+
+
+def test_long_half_lives_use_real_units():
+    assert ISOTOPES["u-238"].half_life == 4.468e9
+    assert ISOTOPES["u-238"].half_life_unit == "y"
+    assert ISOTOPES["bi-209"].half_life == 2.01e19
+    assert all(iso.half_life_unit in TIME_UNITS_IN_SECONDS for iso in ISOTOPES.values())
+
+    with pytest.raises(ValueError):
+        to_seconds(1, "+9")
+
+
+def test_snapshot_round_trip(tmp_path):
+    snapshot_path = tmp_path / "isotopes.npy"
+    assert build_snapshot(snapshot_path=snapshot_path) == len(ISOTOPES)
+
+    registry = IsotopeRegistry.from_snapshot(snapshot_path)
+    assert registry.keys == list(ISOTOPES)
+    # rows become Isotope objects only when looked up
+    assert registry.isotopes._built == {}
+    assert registry.get("I-131") == ISOTOPES["i-131"]
+    assert list(registry.isotopes._built) == ["i-131"]
+
+    assert registry.isotopes == ISOTOPES
+    assert isinstance(registry.decay_consts, np.memmap)
+    assert np.array_equal(registry.decay_consts, np.load(snapshot_path)['decay_const'])
+    assert np.allclose(registry.decay_consts, get_registry().decay_consts)
+
+
+def test_chain_matches_two_member_bateman():
+    parent, daughter = np.log(2) / 10, np.log(2) / 3
+    chain = DecayChain(members=["A", "B", "C"], decay_consts=np.array([parent, daughter, 0]))
+    time = np.linspace(0, 50, 11)
+
+    amounts = chain.solve(1000, time)
+    expected_daughter = 1000 * parent / (daughter - parent) * (np.exp(-parent * time) - np.exp(-daughter * time))
+
+    assert amounts.shape == (3, 11)
+    assert np.allclose(amounts[0], 1000 * np.exp(-parent * time))
+    assert np.allclose(amounts[1], expected_daughter)
+    assert np.allclose(amounts.sum(axis=0), 1000)
+
+
+def test_chain_from_registry_ends_in_stable_member():
+    chain = DecayChain.from_registry(get_registry(), "Ra-226")
+    assert chain.members[:3] == ["Ra-226", "Rn-222", "Po-218"]
+    assert chain.decay_consts[-1] == 0
+    assert np.all(chain.decay_consts[:-1] > 0)
+
+
+def test_matrix_store_reuses_cached_subchains():
+    store = DecayMatrixStore(get_registry(), max_cached_chains=1)
+    time = np.linspace(0, 1e8, 20)
+
+    parent_chain = store.chain("ra-226")
+    assert parent_chain.members == DecayChain.from_registry(get_registry(), "Ra-226").members
+    assert store.matrix.nnz < store.matrix.shape[0] ** 2 / 10
+
+    store.solve(parent_chain, 1000, time)
+    tail = store.chain("Rn-222")
+    amounts = store.solve(tail, 1000, time)
+
+    assert store.stats() == {'chains': 1, 'hits': 1, 'misses': 1}
+    assert np.allclose(amounts, tail.solve(1000, time))
+
+    store.solve(store.chain("Th-232"), 1000, time)
+    store.solve(tail, 1000, time)
+    assert store.stats()['misses'] == 3
+
+
+@pytest.mark.parametrize("method", ["binomial", "poisson"])
+def test_ensemble_matches_binomial_statistics(method):
+    sim = DecaySimulation(
+        init_amt=10000,
+        half_life=10,
+        time_pts=np.linspace(0, 40, 41),
+        isotope_name="test",
+        half_life_unit="s",
+        noise_percentage=0.0,
+        gamma_emission_probability=0,
+        graph="",
+        seed=7
+    )
+
+    remaining = sim.simulate_ensemble(runs=4000, method=method)
+    stats = ensemble_statistics(remaining)
+    survival = np.exp(-sim.decay_const * sim.time_pts)
+
+    assert remaining.shape == (4000, 41)
+    assert np.all(remaining[:, 0] == 10000)
+    assert np.all(np.diff(remaining, axis=1) <= 0)
+    assert np.allclose(stats['mean'], 10000 * survival, rtol=0.01)
+    assert np.allclose(stats['variance'][1:-1], 10000 * survival[1:-1] * (1 - survival[1:-1]), rtol=0.15)
+
+
+def test_seeded_simulations_are_reproducible():
+    def simulate(seed):
+        sim = DecaySimulation(
+            init_amt=1000,
+            half_life=100,
+            time_pts=np.linspace(0, 400, 30),
+            isotope_name="test",
+            half_life_unit="s",
+            noise_percentage=5,
+            gamma_emission_probability=0.5,
+            graph="",
+            seed=seed
+        )
+        return sim.calc_series()
+
+    for a, b in zip(simulate(42), simulate(np.random.default_rng(42))):
+        assert np.array_equal(a, b)
+    assert not np.array_equal(simulate(42)[2], simulate(43)[2])
+
+
+def test_seeded_batch_is_reproducible():
+    def simulate(seed):
+        batch = BatchDecaySimulation(
+            init_amts=[1000, 1000],
+            half_lives=[100, 100],
+            time_pts=np.linspace(0, 400, 30),
+            noise_percentages=5,
+            gamma_emission_probabilities=0.5,
+            seed=seed
+        )
+        return batch.calc_series()
+
+    _, _, first, _ = simulate(7)
+    _, _, second, _ = simulate(7)
+    assert np.array_equal(first, second)
+    assert not np.array_equal(first[0], first[1])
+
+
+def test_merge_moments_matches_full_statistics():
+    rng = np.random.default_rng(0)
+    a, b = rng.normal(size=(30, 4)), rng.normal(3, 2, size=(50, 4))
+    merged = merge_moments(30, a.mean(axis=0), a.var(axis=0) * 30, 50, b.mean(axis=0), b.var(axis=0) * 50)
+
+    full = np.vstack((a, b))
+    assert merged[0] == 80
+    assert np.allclose(merged[1], full.mean(axis=0))
+    assert np.allclose(merged[2] / 80, full.var(axis=0))
+
+
+def test_parallel_ensemble_merges_blocks():
+    sim = DecaySimulation(
+        init_amt=1000,
+        half_life=10,
+        time_pts=np.linspace(0, 40, 21),
+        isotope_name="test",
+        half_life_unit="s",
+        noise_percentage=0.0,
+        gamma_emission_probability=0,
+        graph="",
+        seed=11
+    )
+
+    result = run_ensemble_parallel(sim, runs=300, workers=2, keep_runs=True)
+    stats = ensemble_statistics(result['runs'])
+
+    assert result['runs'].shape == (300, 21)
+    assert np.allclose(result['mean'], stats['mean'])
+    assert np.allclose(result['variance'], stats['variance'])
+    assert np.all(result['histogram'].sum(axis=1) == 300)
+    assert np.array_equal(run_ensemble_parallel(sim, runs=300, workers=2, keep_runs=True)['runs'], result['runs'])
+
+
+def test_ensemble_runs_do_not_depend_on_worker_count():
+    sim = DecaySimulation(
+        init_amt=1000,
+        half_life=10,
+        time_pts=np.linspace(0, 40, 21),
+        isotope_name="test",
+        half_life_unit="s",
+        noise_percentage=0.0,
+        gamma_emission_probability=0,
+        graph="",
+        seed=11
+    )
+
+    runs = 2 * ENSEMBLE_BLOCK_RUNS + 50
+    serial = sim.simulate_ensemble(runs)
+    for workers in (2, 3):
+        result = run_ensemble_parallel(sim, runs=runs, workers=workers, keep_runs=True)
+        assert np.array_equal(result['runs'], serial)
+        assert np.allclose(result['mean'], ensemble_statistics(serial)['mean'])
+
+
+def test_pools_for_other_worker_counts_stay_open():
+    first = get_pool(2)
+    get_pool(3)
+    assert get_pool(2) is first
+    assert first.submit(int, '7').result() == 7
+
+
+def test_closed_form_queries_match_simulation():
+    sim = DecaySimulation(
+        init_amt=500,
+        half_life=8.02,
+        time_pts=np.linspace(0, 32, 9),
+        isotope_name='I-131',
+        half_life_unit='d',
+        noise_percentage=0,
+        gamma_emission_probability=1,
+        graph=[]
+    )
+    amt_decayed, activity, amt_remaining, _ = sim.calc_series()
+
+    assert evaluate_query('remaining', 500, sim.decay_const, sim.time_pts) == pytest.approx(amt_remaining)
+    assert evaluate_query('decayed', 500, sim.decay_const, sim.time_pts) == pytest.approx(amt_decayed)
+    assert evaluate_query('activity', 500, sim.decay_const, sim.time_pts) == pytest.approx(activity)
+    assert evaluate_query('time_to_activity', 500, sim.decay_const, activity[1:]) == pytest.approx(sim.time_pts[1:])
+    assert evaluate_query('time_to_remaining', 500, sim.decay_const, [600]) == [0]
+
+
+def test_adaptive_grid_meets_tolerance_with_fewer_points():
+    curve = lambda time_pts: 1000 * np.exp(-np.log(2) * time_pts)
+    time_pts = adaptive_grid(curve, 4, max_points=1000, tolerance=1e-3)
+
+    midpoints = (time_pts[:-1] + time_pts[1:]) / 2
+    chord = (curve(time_pts[:-1]) + curve(time_pts[1:])) / 2
+    assert np.abs(curve(midpoints) - chord).max() <= 1e-3 * 1000
+
+    # a uniform grid of the same size misses the tolerance where the curve is steepest
+    uniform = np.linspace(0, 4, time_pts.size)
+    midpoints = (uniform[:-1] + uniform[1:]) / 2
+    assert np.abs(curve(midpoints) - (curve(uniform[:-1]) + curve(uniform[1:])) / 2).max() > 1e-3 * 1000
+
+
+def test_adaptive_grid_resolves_short_lived_daughters():
+    chain = DecayChain(['Parent', 'Daughter', 'Stable'], np.array([1e-10, 1e-1, 0.0]))
+    curve = lambda time_pts: chain.solve(1.0, time_pts)
+    time_pts = build_time_grid('adaptive', 1e11, 500, curve=curve, min_time=1.0)
+
+    assert time_pts.size < 500
+    assert time_pts[1] < 10                      # the daughter reaches equilibrium within seconds
+    assert time_pts[0] == 0 and time_pts[-1] == 1e11
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,213 @@
+"""Tests for the NNDC scraper against a local fixture HTTP server."""
+
+import pytest
+import sys
+import os
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'non-runtime', 'nndc_scripts')))
+
+import nndc_isotope_builder as builder
+
+DECAY_PAGE = """
+<html><body><table>
+  <tr>
+    <td class="shead">Parent Nucleus</td><td class="shead" rowspan="2"></td><td class="shead" rowspan="2"></td>
+    <td class="shead">Parent E</td><td class="shead">Parent J&pi;</td><td class="shead">Parent Half-Life</td>
+    <td class="shead">Decay Mode</td><td class="shead">GS-GS Q-value (keV)</td><td class="shead">Daughter Nucleus</td>
+  </tr>
+  <tr>
+    <td>{parent}</td><td></td><td></td><td>0.0</td><td>7/2+</td><td>{half_life}</td>
+    <td>&beta; - : 100 %</td><td>970.8</td><td>{daughter}</td><td></td><td></td>
+  </tr>
+</table></body></html>
+"""
+STABLE_PAGE = "<html><body>No datasets were found since nucleus is stable</body></html>"
+
+PAGES = {
+    'I131': DECAY_PAGE.format(parent='131I', half_life='8.0252 d &plusmn; 6', daughter='131 54 Xe'),
+    'Cs137': DECAY_PAGE.format(parent='137Cs', half_life='30.08 y &plusmn; 9', daughter='137 56 Ba'),
+    'Co60': DECAY_PAGE.format(parent='60Co', half_life='1925.28 d &plusmn; 14', daughter='60 28 Ni'),
+    'C12': STABLE_PAGE
+}
+
+
+@pytest.fixture
+def nndc_server():
+    requests_seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            nuclide = parse_qs(urlparse(self.path).query)['nuc'][0]
+            requests_seen.append(nuclide)
+            page = PAGES.get(nuclide)
+            self.send_response(200 if page else 404)
+            self.end_headers()
+            if page:
+                self.wfile.write(page.encode())
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/decaysearchdirect.jsp", requests_seen
+    server.shutdown()
+
+
+def test_scrape_isotopes_concurrently_and_resume(nndc_server, tmp_path):
+    base_url, requests_seen = nndc_server
+    output_file = str(tmp_path / 'isotopes.json')
+    targets = {'I-131', 'Cs-137', 'Co-60', 'C-12'}
+
+    data = builder.scrape_isotopes(targets=targets, output_file=output_file, base_url=base_url, workers=4, rate=100)
+    assert sorted(data) == ['Co-60', 'Cs-137', 'I-131']
+    assert data['I-131']['half_life'] == 8.0252
+    assert data['I-131']['decay_mode']['type'] == 'beta minus'
+    assert sorted(requests_seen) == ['C12', 'Co60', 'Cs137', 'I131']
+
+    with open(output_file) as f:
+        assert json.load(f) == data
+    assert not os.path.exists(builder.journal_path(output_file))
+    with open(f"{output_file}.cursor") as f:
+        assert json.load(f) == {'position': 4, 'next': None}
+
+    # a finished run leaves nothing to fetch
+    requests_seen.clear()
+    builder.scrape_isotopes(targets=targets, output_file=output_file, base_url=base_url, workers=4, rate=100)
+    assert requests_seen == []
+
+    # starting over refreshes the entries already in the output
+    builder.scrape_isotopes(targets=targets, output_file=output_file, base_url=base_url, workers=4, rate=100,
+                            resume=False)
+    assert sorted(requests_seen) == ['C12', 'Co60', 'Cs137', 'I131']
+
+
+def test_failed_requests_hold_the_cursor(nndc_server, tmp_path):
+    base_url, requests_seen = nndc_server
+    output_file = str(tmp_path / 'isotopes.json')
+    targets = {'Co-60', 'Sr-90', 'I-131'}           # no fixture page for Sr-90
+
+    builder.scrape_isotopes(targets=targets, output_file=output_file, base_url=base_url, workers=2, rate=100)
+    with open(f"{output_file}.cursor") as f:
+        assert json.load(f) == {'position': 1, 'next': 'Sr-90'}
+
+    requests_seen.clear()
+    builder.scrape_isotopes(targets=targets, output_file=output_file, base_url=base_url, workers=2, rate=100)
+    assert requests_seen == ['Sr90']
+
+
+def test_extract_half_life_keeps_the_exponent():
+    assert builder.extract_half_life("4.468×10 +9 y ± 3") == (4.468e9, 'y', '3')
+    assert builder.extract_half_life("1.51×10 7 s") == (1.51e7, 's', 'unknown')
+    assert builder.extract_half_life("12.32 y ± 2") == (12.32, 'y', '2')
+
+
+def test_throttled_requests_retry_through_the_bucket(monkeypatch):
+    monkeypatch.setattr(builder, 'RETRY_BACKOFF', 0.01)
+    attempts = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            attempts.append(time.monotonic())
+            if len(attempts) == 1:
+                self.send_response(429)
+                self.send_header('Retry-After', '1')
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.end_headers()
+            self.wfile.write(PAGES['I131'].encode())
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        bucket = builder.TokenBucket(rate=100, capacity=5)
+        acquire = bucket.acquire
+        acquired = []
+        monkeypatch.setattr(bucket, 'acquire', lambda: acquired.append(acquire()))
+        response = builder.get_response(f"http://127.0.0.1:{server.server_port}/?nuc=I131", bucket=bucket)
+    finally:
+        server.shutdown()
+
+    assert response.status_code == 200
+    assert len(attempts) == 2
+    assert attempts[1] - attempts[0] >= 0.9              # Retry-After outweighs the backoff
+    assert len(acquired) == 2                            # the retry took a token too
+
+
+def test_token_bucket_limits_rate():
+    bucket = builder.TokenBucket(rate=50, capacity=5)
+    start = time.monotonic()
+    for _ in range(15):
+        bucket.acquire()
+    # the first 5 tokens are a burst, the other 10 arrive at 50 per second
+    assert time.monotonic() - start >= 10 / 50 * 0.9
+
+
+def test_compact_dataset_merges_journal_atomically(tmp_path):
+    output_file = str(tmp_path / 'isotopes.json')
+    with open(output_file, 'w') as f:
+        json.dump({'Co-60': {'short_name': 'Co-60', 'half_life': 5.27}}, f)
+
+    # an interrupted run: two complete records and a torn final line
+    with open(builder.journal_path(output_file), 'w') as f:
+        f.write(json.dumps({'short_name': 'Co-60', 'half_life': 1925.28}) + '\n')
+        f.write(json.dumps({'short_name': 'I-131', 'half_life': 8.0252}) + '\n')
+        f.write('{"short_name": "Cs-1')
+
+    data = builder.compact_dataset(output_file)
+    assert data == {
+        'Co-60': {'short_name': 'Co-60', 'half_life': 1925.28},
+        'I-131': {'short_name': 'I-131', 'half_life': 8.0252}
+    }
+    with open(output_file) as f:
+        assert json.load(f) == data
+    assert not os.path.exists(builder.journal_path(output_file))
+    assert sorted(os.listdir(tmp_path)) == ['isotopes.json']
+
+
+def test_html_cache_serves_repeat_scrapes_and_offline_reparse(nndc_server, tmp_path):
+    base_url, requests_seen = nndc_server
+    cache = builder.HtmlCache(str(tmp_path / 'cache'))
+    targets = {'I-131', 'Cs-137', 'Co-60', 'C-12'}
+
+    scraped = builder.scrape_isotopes(targets=targets, output_file=str(tmp_path / 'first.json'), base_url=base_url,
+                                      workers=4, rate=100, cache=cache)
+    assert cache.nuclides() == ['C-12', 'Co-60', 'Cs-137', 'I-131']
+
+    # a fresh run with the same cache never touches the network
+    requests_seen.clear()
+    builder.scrape_isotopes(targets=targets, output_file=str(tmp_path / 'second.json'), base_url=base_url,
+                            workers=4, rate=100, resume=False, cache=cache)
+    assert requests_seen == []
+
+    reparsed = builder.reparse_cache(str(tmp_path / 'cache'), str(tmp_path / 'reparsed.json'), workers=2)
+    assert reparsed == scraped
+    assert list(reparsed) == ['Co-60', 'I-131', 'Cs-137']
+
+
+def test_reparse_skips_dangling_cache_refs(tmp_path):
+    cache = builder.HtmlCache(str(tmp_path / 'cache'))
+    cache.put('I-131', PAGES['I131'])
+    with open(cache.ref_path('Co-60'), 'w') as f:
+        f.write('0' * 64)
+
+    reparsed = builder.reparse_cache(str(tmp_path / 'cache'), str(tmp_path / 'reparsed.json'), workers=1)
+    assert list(reparsed) == ['I-131']
+
+
+def test_html_cache_is_content_addressed(tmp_path):
+    cache = builder.HtmlCache(str(tmp_path))
+    assert cache.put('C-12', STABLE_PAGE) == cache.put('O-16', STABLE_PAGE)
+    assert len(os.listdir(tmp_path / 'objects')) == 1
+    assert cache.get('O-16') == STABLE_PAGE
+    assert cache.get('N-14') is None